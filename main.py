@@ -16,10 +16,97 @@ Pendientes:
 #----------------------------------------------------------------------------------------------
 # MÓDULOS
 #----------------------------------------------------------------------------------------------
-from datetime import datetime, timedelta
+from array import array
+from datetime import date, datetime, timedelta
+import argparse
+import asyncio
+import atexit
+import bisect
+import concurrent.futures
+import contextlib
+import csv
+import io
+import itertools
 import json
 import os
 import re
+import signal
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+
+try:
+    import fcntl # Bloqueo de archivos entre procesos (no disponible en Windows)
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy as np # Sumas vectorizadas en los informes (opcional)
+except ImportError:
+    np = None
+
+#----------------------------------------------------------------------------------------------
+# CONSTANTES
+#----------------------------------------------------------------------------------------------
+ARCHIVO_RENTAS = "rentas.json"
+MAX_ENTRADAS_DIARIO = 500 # Entradas del diario de rentas a partir de las cuales se compacta
+TAMANIO_BLOQUE_LECTURA = 64 * 1024 # Caracteres leídos por bloque al recorrer rentas.json
+
+# Tabla de rentas (ver mostrarTablaRenta)
+MUESTRA_ANCHOS_TABLA = 200 # Filas usadas para calcular los anchos de columna
+MAX_ANCHO_COLUMNA = 24     # Los valores más largos se recortan
+COLUMNAS_SIN_RECORTE = ("ID", "idRenta") # Las claves se muestran completas para poder usarlas
+FILAS_POR_PAGINA = 50
+
+# Posiciones de los valores acumulados por calcularAgregadosRentas
+AGREGADO_CANTIDAD = 0
+AGREGADO_DEPOSITO = 1
+AGREGADO_TOTAL = 2
+AGREGADO_RENTAS = 3
+
+ESTADOS_CERRADOS = ("finalizado", "cancelado") # Estados de renta que ya no retienen accesorios ni depósito
+
+# Campos de una renta en el archivo -> atributo de Renta, en el orden en que se guardan
+CAMPOS_RENTA = {
+    "idRenta": "idRenta",
+    "idCliente": "idCliente",
+    "dias": "dias",
+    "fecha Devolucion": "fechaDevolucion",
+    "total": "total",
+    "deposito": "deposito",
+    "estado": "estado",
+    "metodoPago": "metodoPago",
+    "idAccesorio": "idAccesorio",
+    "cantidad": "cantidad"
+}
+
+GENERADOR_ID_RENTA = {"ultimo": 0} # Microsegundos del último idRenta generado (ver generarIdRenta)
+
+REPOSITORIOS = {} # archivo -> repositorio en memoria (ver obtenerRepositorio)
+BLOQUEOS = {}     # archivo -> bloqueos tomados por este proceso (ver bloqueoArchivo)
+
+# Backend SQLite opcional (ver conectarSQLite). Si no hay conexión se usan los archivos JSON.
+SQLITE = {"conexion": None}
+TABLAS_SQLITE = {
+    "clientes.json": "clientes",
+    "accesorios.json": "accesorios",
+    "rentas.json": "rentas"
+}
+COLUMNAS_CLAVE_SQLITE = {"clientes": "idCliente", "accesorios": "idAccesorio", "rentas": "idRenta"}
+
+# Modo servidor (ver iniciarServidor). El menú conectado a un servidor solo envía operaciones.
+DIRECCION_SERVIDOR = "127.0.0.1:8765" # host:puerto, o ruta de un socket Unix
+SERVIDOR = {"archivo": None} # Conexión del menú con el servidor (ver conectarServidor)
+
+# Importación masiva (ver importarRegistros): tipo de registro -> archivo de datos
+ARCHIVOS_IMPORTACION = {
+    "clientes": "clientes.json",
+    "accesorios": "accesorios.json",
+    "rentas": ARCHIVO_RENTAS
+}
 
 #----------------------------------------------------------------------------------------------
 # FUNCIONES
@@ -126,6 +213,525 @@ def solicitarInput(prompt, validador=None, requerido=True):
             return None
 
 
+def obtenerRepositorio(archivo):
+    """
+    Devuelve el repositorio en memoria asociado a un archivo. El archivo se lee
+    una sola vez; las operaciones siguientes trabajan sobre los datos residentes.
+    Args:
+        archivo (str): Nombre del archivo JSON.
+    Returns:
+        dict: Repositorio con las claves:
+              archivo, datos (dict), sucios (set de claves modificadas)
+              version (versión del archivo leído, ver versionArchivo)
+              posicionDiario (bytes del diario ya aplicados, solo rentas)
+              entradasDiario (entradas del diario, solo rentas)
+              indice (índice de fechas de las rentas, ver construirIndiceRentas,
+                      de búsqueda de los clientes, ver construirIndiceClientes,
+                      o de accesorios activos, ver construirIndiceAccesorios)
+              agregados (agregados de informes, solo rentas; ver obtenerAgregadosRentas)
+              reservas (unidades reservadas por día, solo rentas; ver construirReservas)
+              agregadosModificados (si los agregados deben guardarse)
+              y aniosCargados (años de rentas cargados completos, o None si están todos;
+                               ver cargarAniosRentas).
+    """
+    repo = REPOSITORIOS.get(archivo)
+    if repo is None:
+        version = None
+        posicion = 0
+        entradas = 0
+        aniosCargados = None
+        if SQLITE["conexion"] is not None:
+            version = versionSQLite()
+            datos = cargarTablaSQLite(tablaSQLite(archivo))
+        elif archivo == ARCHIVO_RENTAS:
+            # Al iniciar se carga completo solo el año actual; de los demás, las rentas abiertas
+            aniosCargados = {datetime.now().year}
+            datos, version, posicion, entradas = cargarRentasConPosicion(archivo, aniosCargados)
+        else:
+            try:
+                version = versionArchivo(archivo)
+                datos = leerJSON(archivo)
+            except OSError as e:
+                print("No se pudo abrir el archivo:", e)
+                datos = {}
+        if datos is None:
+            datos = {}
+        repo = {
+            "archivo": archivo,
+            "datos": datos,
+            "sucios": set(),
+            "version": version,
+            "posicionDiario": posicion,
+            "entradasDiario": entradas,
+            "indice": construirIndice(archivo, datos),
+            "agregados": cargarAgregadosRentas(archivo) if archivo == ARCHIVO_RENTAS and SQLITE["conexion"] is None else None,
+            "reservas": construirReservas(datos) if archivo == ARCHIVO_RENTAS else None,
+            "agregadosModificados": False,
+            "aniosCargados": aniosCargados
+        }
+        REPOSITORIOS[archivo] = repo
+        if entradas >= MAX_ENTRADAS_DIARIO:
+            with bloqueoArchivo(archivo):
+                sincronizarRentas(repo)
+                compactarRepositorioRentas(repo)
+    return repo
+
+def obtenerDatos(archivo):
+    """
+    Devuelve el diccionario residente con los datos del archivo.
+    Todas las funciones comparten el mismo diccionario, por lo que no quedan copias desactualizadas.
+    Antes de devolverlo incorpora los cambios que otros procesos hayan guardado (sin bloquear).
+    """
+    repo = obtenerRepositorio(archivo)
+    refrescarRepositorio(repo)
+    return repo["datos"]
+
+def marcarModificado(archivo, clave):
+    """
+    Registra que el registro `clave` del archivo fue agregado, modificado o borrado
+    y debe guardarse en el próximo guardado. Mantiene al día los índices de clientes y accesorios.
+    """
+    repo = obtenerRepositorio(archivo)
+    repo["sucios"].add(clave)
+    if archivo == "clientes.json":
+        indexarCliente(repo["indice"], clave, repo["datos"].get(clave))
+    elif archivo == "accesorios.json":
+        indexarAccesorio(repo["indice"], clave, repo["datos"].get(clave))
+
+def construirIndice(archivo, datos):
+    """
+    Construye el índice en memoria que corresponde al archivo, o None si no tiene.
+    """
+    if archivo == ARCHIVO_RENTAS:
+        return construirIndiceRentas(datos)
+    if archivo == "clientes.json":
+        return construirIndiceClientes(datos)
+    if archivo == "accesorios.json":
+        return construirIndiceAccesorios(datos)
+    return None
+
+def versionArchivo(archivo):
+    """
+    Identifica la versión de un archivo (inodo, fecha de modificación y tamaño).
+    Como los archivos se guardan con un renombrado atómico, cada guardado cambia la versión.
+    Returns:
+        tuple: Versión del archivo o None si no existe.
+    """
+    try:
+        estado = os.stat(archivo)
+    except FileNotFoundError:
+        return None
+    return (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+
+@contextlib.contextmanager
+def bloqueoArchivo(archivo):
+    """
+    Bloqueo exclusivo entre procesos (fcntl, advisory) sobre `archivo`, mientras dura el bloque with.
+    Solo lo toman las escrituras: las lecturas no bloquean porque los archivos se reemplazan
+    de forma atómica. Es reentrante dentro del mismo proceso.
+    En sistemas sin fcntl (Windows) no bloquea.
+    """
+    if fcntl is None or archivo in BLOQUEOS:
+        BLOQUEOS[archivo] = BLOQUEOS.get(archivo, 0) + 1
+        try:
+            yield
+        finally:
+            BLOQUEOS[archivo] -= 1
+            if BLOQUEOS[archivo] == 0:
+                del BLOQUEOS[archivo]
+        return
+
+    f = open(archivo + ".lock", mode='a')
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        BLOQUEOS[archivo] = 1
+        try:
+            yield
+        finally:
+            del BLOQUEOS[archivo]
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    finally:
+        f.close()
+
+def refrescarRepositorio(repo):
+    """
+    Incorpora al repositorio los cambios que otros procesos guardaron en su archivo.
+    Si el archivo cambió desde la última lectura, se vuelve a leer y se le aplican encima
+    los registros modificados localmente que todavía no se guardaron (gana el último en guardar,
+    registro por registro). Las rentas se sincronizan leyendo solo lo nuevo del diario.
+    Con una base SQLite, la tabla se vuelve a leer si otra conexión guardó cambios (ver versionSQLite).
+    """
+    archivo = repo["archivo"]
+    if SQLITE["conexion"] is not None:
+        version = versionSQLite()
+        if version == repo["version"]:
+            return
+        enDisco = cargarTablaSQLite(tablaSQLite(archivo))
+    elif archivo == ARCHIVO_RENTAS:
+        sincronizarRentas(repo)
+        return
+    else:
+        version = versionArchivo(archivo)
+        if version == repo["version"]:
+            return
+        enDisco = leerJSON(archivo) or {}
+    for clave in repo["sucios"]:
+        if clave in repo["datos"]:
+            enDisco[clave] = repo["datos"][clave]
+        else:
+            enDisco.pop(clave, None)
+    # Se actualiza el mismo diccionario para que las referencias existentes sigan siendo válidas
+    repo["datos"].clear()
+    repo["datos"].update(enDisco)
+    repo["indice"] = construirIndice(archivo, repo["datos"])
+    if archivo == ARCHIVO_RENTAS:
+        repo["reservas"] = construirReservas(repo["datos"])
+        repo["agregados"] = None
+    repo["version"] = version
+
+def guardarRepositorio(archivo):
+    """
+    Guarda en disco el archivo si tiene registros modificados.
+    La escritura se hace con el archivo bloqueado y después de incorporar los cambios
+    guardados por otros procesos, para no pisarlos.
+    Returns:
+        bool: True si no había cambios o se guardaron correctamente.
+    """
+    repo = REPOSITORIOS.get(archivo)
+    if repo is None:
+        return True
+    if repo["agregadosModificados"] and SQLITE["conexion"] is None:
+        # La firma se toma de los archivos: los agregados deben incluir todo lo que hay en ellos
+        with bloqueoArchivo(archivo):
+            sincronizarRentas(repo)
+            guardarAgregadosRentas(archivo, repo)
+    if not repo["sucios"]:
+        return True
+    if SQLITE["conexion"] is not None:
+        if guardarRegistrosSQLite(tablaSQLite(archivo), repo["datos"], repo["sucios"]):
+            repo["sucios"].clear()
+            return True
+        return False
+    try:
+        with bloqueoArchivo(archivo):
+            refrescarRepositorio(repo)
+            escribirJSONAtomico(archivo, repo["datos"])
+            repo["version"] = versionArchivo(archivo)
+        repo["sucios"].clear()
+        return True
+    except OSError as e:
+        print("No se pudo guardar el archivo:", e)
+        return False
+
+def guardarRepositorios():
+    """
+    Guarda todos los repositorios con cambios pendientes.
+    Se llama al volver de cada submenú y al salir del programa.
+    Returns:
+        bool: True si todos se guardaron correctamente.
+    """
+    ok = True
+    for archivo in list(REPOSITORIOS):
+        ok = guardarRepositorio(archivo) and ok
+    return ok
+
+def aplicarRentaEnRepositorio(repo, idRenta, renta):
+    """
+    Aplica una renta nueva, modificada o eliminada (renta=None) sobre los datos residentes,
+    el índice de fechas, las reservas y los agregados de informes del repositorio de rentas.
+    """
+    datos = repo["datos"]
+    anterior = datos.get(idRenta)
+    fechaAnterior = repo["indice"]["fechas"].get(idRenta)
+    # Si el año no está cargado, la renta puede estar en disco sin estar residente:
+    # no se conoce su versión anterior y los agregados se recalculan
+    desconocida = (anterior is None and repo["aniosCargados"] is not None
+                   and anioRenta(idRenta) not in repo["aniosCargados"])
+    if renta is None:
+        datos.pop(idRenta, None)
+        desindexarRenta(repo["indice"], idRenta)
+    else:
+        renta = aRenta(renta)
+        datos[idRenta] = renta
+        indexarRenta(repo["indice"], idRenta, renta)
+    reservarRenta(repo["reservas"], idRenta, renta)
+
+    # Los informes se actualizan con la diferencia, sin recorrer todas las rentas
+    if repo["agregados"] is not None and desconocida:
+        repo["agregados"] = None
+    elif repo["agregados"] is not None:
+        try:
+            if anterior is not None:
+                aplicarRentaEnAgregados(repo["agregados"], anterior, fechaAnterior, -1)
+            if renta is not None:
+                aplicarRentaEnAgregados(repo["agregados"], renta, repo["indice"]["fechas"][idRenta])
+            repo["agregadosModificados"] = True
+        except Exception as e:
+            print(f"Error procesando renta {idRenta}: {e}")
+            repo["agregados"] = None # Se recalculan en el próximo informe
+
+def sincronizarRentas(repo):
+    """
+    Incorpora las rentas que otros procesos registraron desde la última lectura.
+    Normalmente solo lee las líneas nuevas del diario; si otro proceso compactó
+    las rentas (cambió algún archivo por año), las vuelve a cargar completas.
+    """
+    if SQLITE["conexion"] is not None:
+        return
+    archivo = repo["archivo"]
+    ruta = rutaDiarioRentas(archivo)
+    tamanioDiario = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+    if versionRentas(archivo) != repo["version"] or tamanioDiario < repo["posicionDiario"]:
+        datos, version, posicion, entradas = cargarRentasConPosicion(archivo, repo["aniosCargados"])
+        repo["datos"].clear()
+        repo["datos"].update(datos)
+        repo["indice"] = construirIndiceRentas(repo["datos"])
+        repo["reservas"] = construirReservas(repo["datos"])
+        repo["agregados"] = None
+        repo["version"] = version
+        repo["posicionDiario"] = posicion
+        repo["entradasDiario"] = entradas
+        return
+
+    for idRenta, renta, posicion in leerDiarioDesde(ruta, repo["posicionDiario"]):
+        aplicarRentaEnRepositorio(repo, idRenta, renta)
+        repo["posicionDiario"] = posicion
+        repo["entradasDiario"] += 1
+
+def compactarRepositorioRentas(repo, rentasNuevas=None):
+    """
+    Compacta el diario del repositorio de rentas dentro de los archivos por año.
+    Solo se reescriben los años que tienen entradas en el diario, más los de `rentasNuevas`
+    (rentas agregadas al repositorio sin pasar por el diario, ver guardarRentasImportadas).
+    Debe llamarse con el archivo de rentas bloqueado y sincronizado.
+    Returns:
+        bool: True si se compactó.
+    """
+    archivo = repo["archivo"]
+    anios = {anioRenta(idRenta) for idRenta in rentasNuevas or ()}
+    anios.update(anioRenta(idRenta) for idRenta, _ in leerEntradasJSONL(rutaDiarioRentas(archivo)))
+    if not compactarRentas(archivo, anios, rentasNuevas):
+        return False
+    repo["version"] = versionRentas(archivo)
+    repo["posicionDiario"] = 0
+    repo["entradasDiario"] = 0
+    repo["agregadosModificados"] = True # Cambió la firma de las rentas guardadas
+    return True
+
+def registrarRenta(archivo, idRenta, renta):
+    """
+    Agrega (o reemplaza) una renta en el repositorio de rentas y la escribe en el diario
+    (o en la base SQLite, si está conectada).
+    La escritura se hace con el archivo de rentas bloqueado y después de incorporar
+    las rentas registradas por otros procesos.
+    Cuando el diario acumula MAX_ENTRADAS_DIARIO entradas se compacta.
+    Returns:
+        bool: True si la renta se guardó correctamente.
+    """
+    repo = obtenerRepositorio(archivo)
+    if SQLITE["conexion"] is not None:
+        if not guardarRegistrosSQLite("rentas", {idRenta: renta}, [idRenta]):
+            return False
+        aplicarRentaEnRepositorio(repo, idRenta, renta)
+        return True
+
+    with bloqueoArchivo(archivo):
+        sincronizarRentas(repo)
+        if not agregarRentaAlDiario(archivo, idRenta, renta):
+            return False
+        aplicarRentaEnRepositorio(repo, idRenta, renta)
+        repo["posicionDiario"] = os.path.getsize(rutaDiarioRentas(archivo))
+        repo["entradasDiario"] += 1
+        if repo["entradasDiario"] >= MAX_ENTRADAS_DIARIO:
+            compactarRepositorioRentas(repo)
+    return True
+
+def cargarAnioRentas(repo, anio):
+    """
+    Carga completas en el repositorio las rentas de un año que todavía no estaba cargado:
+    las de su archivo que no están residentes. Las que ya lo están (abiertas o modificadas
+    por el diario) se conservan, y las que el diario eliminó no se agregan.
+    """
+    archivo = repo["archivo"]
+    ruta = rutaParticionRentas(archivo, anio)
+    while True:
+        sincronizarRentas(repo)
+        version = dict(repo["version"]).get(anio)
+        particion = leerJSON(ruta) if version is not None else {}
+        if versionArchivo(ruta) == version:
+            break # Si otro proceso compactó mientras se leía, se sincroniza y se vuelve a leer
+
+    # Entradas del diario ya aplicadas al repositorio: su versión residente es la actual
+    enDiario = set()
+    for idRenta, _, posicion in leerDiarioDesde(rutaDiarioRentas(archivo), 0):
+        if posicion > repo["posicionDiario"]:
+            break
+        if anioRenta(idRenta) == anio:
+            enDiario.add(idRenta)
+
+    datos = repo["datos"]
+    for idRenta, renta in particion.items():
+        if idRenta in datos or idRenta in enDiario:
+            continue
+        renta = aRenta(renta)
+        datos[idRenta] = renta
+        indexarRenta(repo["indice"], idRenta, renta)
+        reservarRenta(repo["reservas"], idRenta, renta)
+    repo["aniosCargados"].add(anio)
+
+def cargarAniosRentas(anios=None):
+    """
+    Devuelve las rentas residentes después de asegurarse de que las de los años indicados
+    estén cargadas completas. Al iniciar solo se carga el año actual (y las rentas abiertas
+    de los demás, que ocupan accesorios): los informes sobre otros años los cargan con esta función.
+    Args:
+        anios (list, opcional): Años que se necesitan. Si es None, todos.
+    Returns:
+        dict: Rentas residentes (ver obtenerDatos).
+    """
+    rentas = obtenerDatos(ARCHIVO_RENTAS)
+    repo = obtenerRepositorio(ARCHIVO_RENTAS)
+    if repo["aniosCargados"] is None:
+        return rentas
+    faltan = set(aniosParticiones(ARCHIVO_RENTAS) if anios is None else anios) - repo["aniosCargados"]
+    for anio in sorted(faltan):
+        cargarAnioRentas(repo, anio)
+    if anios is None:
+        repo["aniosCargados"] = None # Los años nuevos llegan por el diario
+    return rentas
+
+def conectarSQLite(ruta):
+    """
+    Conecta el programa a una base SQLite y crea las tablas e índices si no existen.
+    A partir de ese momento los repositorios se leen y guardan en la base en lugar de los JSON.
+    Args:
+        ruta (str): Ruta del archivo de la base de datos.
+    Returns:
+        sqlite3.Connection: La conexión abierta.
+    """
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript("""
+        CREATE TABLE IF NOT EXISTS clientes (
+            idCliente TEXT PRIMARY KEY,
+            email TEXT,
+            apellido TEXT,
+            activo INTEGER,
+            datos TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS accesorios (
+            idAccesorio TEXT PRIMARY KEY,
+            activo INTEGER,
+            datos TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS rentas (
+            idRenta TEXT PRIMARY KEY,
+            idCliente TEXT,
+            idAccesorio TEXT,
+            anio INTEGER,
+            mes INTEGER,
+            fecha TEXT,
+            datos TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_rentas_cliente ON rentas (idCliente);
+        CREATE INDEX IF NOT EXISTS idx_rentas_accesorio ON rentas (idAccesorio);
+        CREATE INDEX IF NOT EXISTS idx_rentas_fecha ON rentas (anio, mes, fecha);
+    """)
+    SQLITE["conexion"] = conexion
+    return conexion
+
+def versionSQLite():
+    """
+    Devuelve el número de versión de la base (PRAGMA data_version): cambia cuando otra
+    conexión (por ejemplo, otro mostrador) guarda cambios, y no con los de esta conexión.
+    """
+    return SQLITE["conexion"].execute("PRAGMA data_version").fetchone()[0]
+
+def tablaSQLite(archivo):
+    """
+    Devuelve la tabla SQLite que reemplaza al archivo JSON indicado.
+    """
+    return TABLAS_SQLITE[os.path.basename(archivo)]
+
+def filaSQLite(tabla, clave, registro):
+    """
+    Arma la fila a guardar en `tabla`: columnas indexadas más el registro completo en JSON.
+    """
+    datos = serializarJSON(registro)
+    if tabla == "clientes":
+        return (clave, registro.get("email"), registro.get("apellido"), int(registro.get("activo", True)), datos)
+    if tabla == "accesorios":
+        return (clave, int(registro.get("activo", True)), datos)
+    anio, mes, dia = parsearFechaRenta(registro["idRenta"])
+    fecha = f"{anio:04d}-{mes:02d}-{dia:02d}"
+    return (clave, registro.get("idCliente"), registro.get("idAccesorio"), anio, mes, fecha, datos)
+
+def cargarTablaSQLite(tabla):
+    """
+    Lee todos los registros de una tabla y los devuelve con el mismo formato que el archivo JSON.
+    """
+    consulta = f"SELECT {COLUMNAS_CLAVE_SQLITE[tabla]}, datos FROM {tabla}"
+    if tabla == "rentas":
+        return {clave: aRenta(json.loads(datos)) for clave, datos in SQLITE["conexion"].execute(consulta)}
+    return {clave: json.loads(datos) for clave, datos in SQLITE["conexion"].execute(consulta)}
+
+def guardarRegistrosSQLite(tabla, datos, claves):
+    """
+    Guarda en `tabla` los registros indicados en una sola transacción.
+    Las claves que ya no están en `datos` se borran de la tabla.
+    Returns:
+        bool: True si se guardaron correctamente.
+    """
+    conexion = SQLITE["conexion"]
+    try:
+        with conexion:
+            for clave in claves:
+                if clave in datos:
+                    fila = filaSQLite(tabla, clave, datos[clave])
+                    conexion.execute(
+                        f"INSERT OR REPLACE INTO {tabla} VALUES ({', '.join('?' * len(fila))})",
+                        fila
+                    )
+                else:
+                    conexion.execute(f"DELETE FROM {tabla} WHERE {COLUMNAS_CLAVE_SQLITE[tabla]} = ?", (clave,))
+        return True
+    except (sqlite3.Error, KeyError, ValueError) as e:
+        print("No se pudo guardar en la base de datos:", e)
+        return False
+
+def consultarRentasPorMesSQLite(mes, anio=None):
+    """
+    Devuelve las rentas de un mes (y opcionalmente de un año) usando el índice por fecha de la base.
+    """
+    consulta = "SELECT idRenta, datos FROM rentas WHERE mes = ?"
+    parametros = [mes]
+    if anio is not None:
+        consulta = "SELECT idRenta, datos FROM rentas WHERE anio = ? AND mes = ?"
+        parametros = [anio, mes]
+    return {clave: aRenta(json.loads(datos)) for clave, datos in SQLITE["conexion"].execute(consulta + " ORDER BY fecha", parametros)}
+
+def consultarRentasClienteSQLite(idCliente):
+    """
+    Devuelve las rentas de un cliente usando el índice por idCliente de la base.
+    """
+    consulta = "SELECT idRenta, datos FROM rentas WHERE idCliente = ? ORDER BY fecha"
+    return {clave: aRenta(json.loads(datos)) for clave, datos in SQLITE["conexion"].execute(consulta, (idCliente,))}
+
+def importarJSONaSQLite(ruta):
+    """
+    Importa a la base SQLite todos los datos de los archivos JSON (las rentas incluyen su diario).
+    Los registros que ya existían en la base se reemplazan.
+    Args:
+        ruta (str): Ruta del archivo de la base de datos.
+    """
+    conexion = SQLITE["conexion"] or conectarSQLite(ruta)
+    for archivo, tabla in TABLAS_SQLITE.items():
+        if archivo == ARCHIVO_RENTAS:
+            datos = cargarRentasDesdeArchivo(archivo)
+        else:
+            datos = leerJSON(archivo) or {}
+        if guardarRegistrosSQLite(tabla, datos, list(datos)):
+            print(f"{len(datos)} registro(s) importados de {archivo} a la tabla {tabla}.")
+
 def obtenerDatosCliente(documento):
     """
     Solicita por consola los datos de un cliente y devuelve un diccionario con su información.
@@ -164,31 +770,34 @@ def altaCliente(archivo):
     Returns:
         None
     """
-    try:
-        try:
-            f = open(archivo, "r", encoding="utf-8")
-            clientes = json.load(f)
-            f.close()
-            if clientes is None:
-                clientes = {}
-        except (FileNotFoundError): 
-            clientes = {}
-        while True:
-            documento = solicitarInput("Ingrese el documento del cliente (o -1 para terminar): ", parseString, requerido=True)
-            if documento == '-1':
-                break
-            if documento in clientes:
-                print("El cliente ya existe. Intente con otro documento.")  
-            else:
-                cliente = obtenerDatosCliente(documento)
-                clientes[documento] = cliente
-                print(f"Cliente {documento} agregado.")
-        f = open(archivo, mode='w', encoding='utf-8')
-        json.dump(clientes, f, ensure_ascii=False, indent=4)
-        f.close()
+    while True:
+        documento = solicitarInput("Ingrese el documento del cliente (o -1 para terminar): ", parseString, requerido=True)
+        if documento == '-1':
+            break
+        # Conectado a un servidor, la existencia del cliente la verifica el servidor al registrarlo
+        if SERVIDOR["archivo"] is None and documento in obtenerDatos(archivo):
+            print("El cliente ya existe. Intente con otro documento.")  
+        else:
+            cliente = obtenerDatosCliente(documento)
+            ejecutarOperacion("altaCliente", documento=documento, cliente=cliente)
 
-    except(OSError) as error:
-        print("Error al intentar abrir archivo(s):", error)    
+def registrarCliente(archivo, documento, cliente):
+    """
+    Agrega un cliente ya completo al dict `clientes`, si el documento no existe.
+    Args:
+        archivo (str): Nombre del archivo de clientes.
+        documento (str): Documento del cliente.
+        cliente (dict): Datos del cliente (ver obtenerDatosCliente).
+    Returns:
+        None
+    """
+    clientes = obtenerDatos(archivo)
+    if documento in clientes:
+        print("El cliente ya existe. Intente con otro documento.")
+        return
+    clientes[documento] = cliente
+    marcarModificado(archivo, documento)
+    print(f"Cliente {documento} agregado.")
     
 def mostrarCliente(cliente, idCliente):
     """
@@ -222,22 +831,15 @@ def listarClientes(archivo):
         None
     """
 
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        clientes = json.load(f)
-        f.close()
-        if clientes is None:
-            print("No hay clientes activos.")
-            return
-        else:
-            print("Listado de clientes activos:")
-            for idCliente, cliente in clientes.items():
-                if  cliente.get('activo', True):
-                    mostrarCliente(cliente, idCliente)
-    except FileNotFoundError:
+    clientes = obtenerDatos(archivo)
+    if not clientes:
         print("No hay clientes activos.")
-    except OSError as e:
-        print("Error al intentar abrir archivo(s):", e)
+        return
+    else:
+        print("Listado de clientes activos:")
+        for idCliente, cliente in clientes.items():
+            if  cliente.get('activo', True):
+                mostrarCliente(cliente, idCliente)
 
 def eliminarCliente(archivo, documento):
     """
@@ -248,24 +850,118 @@ def eliminarCliente(archivo, documento):
     Returns:
         None
     """
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        clientes = json.load(f)
-        f.close()
+    clientes = obtenerDatos(archivo)
 
-        if documento in clientes:
-            if not clientes[documento]['activo']:
-                print(f"El cliente con documento {documento} ya estaba inactivo.")
-            else:
-                clientes[documento]['activo'] = False  # Cambiar a inactivo
-                f = open(archivo, mode='w', encoding='utf-8')
-                json.dump(clientes, f, ensure_ascii=False, indent=4)
-                f.close()
-                print(f"Cliente con documento {documento} eliminado exitosamente.")
+    if documento in clientes:
+        if not clientes[documento]['activo']:
+            print(f"El cliente con documento {documento} ya estaba inactivo.")
         else:
-            print(f"El cliente con documento {documento} no existe.")
-    except(FileNotFoundError, OSError) as error:
-        print("Error al intentar abrir archivo(s):", error)    
+            clientes[documento]['activo'] = False  # Cambiar a inactivo
+            marcarModificado(archivo, documento)
+            print(f"Cliente con documento {documento} eliminado exitosamente.")
+    else:
+        print(f"El cliente con documento {documento} no existe.")
+
+def normalizarTexto(texto):
+    """
+    Pasa un texto a minúsculas y sin tildes, para comparar sin distinguirlas ("Pérez" = "perez").
+    """
+    texto = unicodedata.normalize("NFKD", str(texto).strip().lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+def normalizarTelefono(telefono):
+    """
+    Deja solo los dígitos de un teléfono.
+    """
+    return "".join(c for c in str(telefono) if c.isdigit())
+
+def construirIndiceClientes(clientes):
+    """
+    Construye los índices de búsqueda de los clientes activos.
+    Returns:
+        dict: Índice con las claves:
+              email (email normalizado -> set de documentos)
+              telefono (dígitos del teléfono -> set de documentos)
+              apellidos (lista ordenada de (apellido normalizado, documento), para buscar por prefijo)
+              claves (documento -> (email, teléfonos, apellido) con que está indexado)
+    """
+    indice = {"email": {}, "telefono": {}, "apellidos": [], "claves": {}}
+    for documento, cliente in clientes.items():
+        indexarCliente(indice, documento, cliente)
+    return indice
+
+def indexarCliente(indice, documento, cliente):
+    """
+    Actualiza el índice de clientes con la versión actual de un cliente.
+    Si el cliente no existe (None) o está inactivo, se quita del índice.
+    """
+    anterior = indice["claves"].pop(documento, None)
+    if anterior is not None:
+        email, telefonos, apellido = anterior
+        indice["email"][email].discard(documento)
+        if not indice["email"][email]:
+            del indice["email"][email]
+        for telefono in telefonos:
+            indice["telefono"][telefono].discard(documento)
+            if not indice["telefono"][telefono]:
+                del indice["telefono"][telefono]
+        pos = bisect.bisect_left(indice["apellidos"], (apellido, documento))
+        del indice["apellidos"][pos]
+
+    if not isinstance(cliente, dict) or not cliente.get("activo", True):
+        return
+    email = normalizarTexto(cliente.get("email", ""))
+    telefonos = cliente.get("telefonos")
+    telefonos = tuple(t for t in {normalizarTelefono(t) for t in telefonos.values()} if t) if isinstance(telefonos, dict) else ()
+    apellido = normalizarTexto(cliente.get("apellido", ""))
+
+    indice["email"].setdefault(email, set()).add(documento)
+    for telefono in telefonos:
+        indice["telefono"].setdefault(telefono, set()).add(documento)
+    bisect.insort(indice["apellidos"], (apellido, documento))
+    indice["claves"][documento] = (email, telefonos, apellido)
+
+def buscarClientes(archivo, criterio, valor):
+    """
+    Busca clientes activos por email o teléfono exactos, o por prefijo del apellido,
+    usando el índice de clientes (sin recorrer todos los clientes).
+    Args:
+        archivo (str): Nombre del archivo de clientes.
+        criterio (str): "email", "telefono" o "apellido".
+        valor (str): Valor a buscar. No distingue mayúsculas ni tildes.
+    Returns:
+        list: Documentos de los clientes encontrados, ordenados.
+    """
+    obtenerDatos(archivo) # Incorpora los cambios de otros procesos
+    indice = obtenerRepositorio(archivo)["indice"]
+    if criterio == "email":
+        return sorted(indice["email"].get(normalizarTexto(valor), ()))
+    if criterio == "telefono":
+        return sorted(indice["telefono"].get(normalizarTelefono(valor), ()))
+
+    prefijo = normalizarTexto(valor)
+    apellidos = indice["apellidos"]
+    encontrados = []
+    pos = bisect.bisect_left(apellidos, (prefijo, ""))
+    while pos < len(apellidos) and apellidos[pos][0].startswith(prefijo):
+        encontrados.append(apellidos[pos][1])
+        pos += 1
+    return encontrados
+
+def mostrarBusquedaClientes(archivo, criterio, valor):
+    """
+    Muestra por consola los clientes activos encontrados (ver buscarClientes).
+    Returns:
+        None
+    """
+    clientes = obtenerDatos(archivo)
+    encontrados = buscarClientes(archivo, criterio, valor)
+    if not encontrados:
+        print("No se encontraron clientes.")
+        return
+    print(f"{len(encontrados)} cliente(s) encontrados:")
+    for documento in encontrados:
+        mostrarCliente(clientes[documento], documento)
 
 def leerCampo(label, valorActual, parseFn):
     """
@@ -297,84 +993,98 @@ def modificarCliente(archivo, documento):
     Returns:
         dict: El dict `clientes` actualizado.
     """
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        clientes = json.load(f)
-        f.close()
+    clientes = obtenerDatos(archivo)
 
-        if documento not in clientes:
-            print(f"No se encontró un cliente con el documento {documento}.")
-            return
-        else:
-            print("Ingrese datos a modificar, presione ENTER para mantener el valor actual.")
-            datos = clientes[documento]
-        
-            nuevoDoc = leerCampo("Ingrese nuevo documento", datos['idCliente'], parseString)
-            if nuevoDoc != datos['idCliente']:
-                datos['idCliente'] = nuevoDoc
-                clientes[nuevoDoc] = datos
-                del clientes[documento]
-                documento = nuevoDoc  
-
-            telefonosActual = ", ".join(datos['telefonos'].values())
-            nuevosTel= leerCampo("Teléfonos", telefonosActual, parseTelefonos)
-            if isinstance(nuevosTel, dict):  
-                datos['telefonos'] = nuevosTel 
-
-            datos['tipoDocumento']  = leerCampo("Tipo de documento",   datos['tipoDocumento'], parseString)
-            datos['nombre']        = leerCampo("Nombre",              datos['nombre'], parseString)
-            datos['apellido']      = leerCampo("Apellido",            datos['apellido'], parseString)
-            nuevoEmail = leerCampo("Email",               datos['email'], parseString)
+    if documento not in clientes:
+        print(f"No se encontró un cliente con el documento {documento}.")
+        return
+    else:
+        print("Ingrese datos a modificar, presione ENTER para mantener el valor actual.")
+        datos = dict(clientes[documento]) # Copia: los cambios se aplican solo al confirmar
+        documentoOriginal = documento
+    
+        nuevoDoc = leerCampo("Ingrese nuevo documento", datos['idCliente'], parseString)
+        if nuevoDoc != datos['idCliente']:
+            datos['idCliente'] = nuevoDoc
+            documento = nuevoDoc  
 
-            while True:
-                try:
-                    if nuevoEmail and validarEmail(nuevoEmail):
-                        datos['email'] = nuevoEmail
-                        break 
-                    else:
-                        print("Email inválido. Intente nuevamente.")
-                        nuevoEmail = leerCampo("Email", datos['email'], parseString)
-                except Exception as e:
-                    print(f"Error al validar email: {e}")
+        telefonosActual = ", ".join(datos['telefonos'].values())
+        nuevosTel= leerCampo("Teléfonos", telefonosActual, parseTelefonos)
+        if isinstance(nuevosTel, dict):  
+            datos['telefonos'] = nuevosTel 
+
+        datos['tipoDocumento']  = leerCampo("Tipo de documento",   datos['tipoDocumento'], parseString)
+        datos['nombre']        = leerCampo("Nombre",              datos['nombre'], parseString)
+        datos['apellido']      = leerCampo("Apellido",            datos['apellido'], parseString)
+        nuevoEmail = leerCampo("Email",               datos['email'], parseString)
+
+        while True:
+            try:
+                if nuevoEmail and validarEmail(nuevoEmail):
+                    datos['email'] = nuevoEmail
+                    break 
+                else:
                     print("Email inválido. Intente nuevamente.")
                     nuevoEmail = leerCampo("Email", datos['email'], parseString)
-            
+            except Exception as e:
+                print(f"Error al validar email: {e}")
+                print("Email inválido. Intente nuevamente.")
+                nuevoEmail = leerCampo("Email", datos['email'], parseString)
+        
 
-            nuevaFecha = leerCampo("Fecha de nacimiento (YYYY-MM-DD)", datos['fechaNacimiento'], parseString)
-            
-            while True:
-                try:
-                    if nuevaFecha and validarFecha(nuevaFecha):
-                        datos['fechaNacimiento'] = nuevaFecha
-                        break 
-                    else:
-                        print("Fecha inválida. Intente nuevamente.")
-                        nuevaFecha = leerCampo("Fecha de nacimiento (YYYY-MM-DD)", datos['fechaNacimiento'], parseString)
-                except Exception as e:
-                    print(f"Error al validar fecha: {e}")
+        nuevaFecha = leerCampo("Fecha de nacimiento (YYYY-MM-DD)", datos['fechaNacimiento'], parseString)
+        
+        while True:
+            try:
+                if nuevaFecha and validarFecha(nuevaFecha):
+                    datos['fechaNacimiento'] = nuevaFecha
+                    break 
+                else:
                     print("Fecha inválida. Intente nuevamente.")
                     nuevaFecha = leerCampo("Fecha de nacimiento (YYYY-MM-DD)", datos['fechaNacimiento'], parseString)
-            activoNuevo = leerCampo(
-                "¿Está activo? (True/False)",
-                "true" if datos["activo"] else "false",
-                parseString
-            )
-            datos["activo"] = activoNuevo.lower() == "true"
-
-            print(f"\nValor actualizado de cliente {documento}:\n")
-            mostrarCliente(datos, documento)
-            confirmacion = input("Ingrese 1 para confirmar, 0 para cancelar: ")
-            if confirmacion == "1":
-                f = open(archivo, mode='w', encoding='utf-8')
-                json.dump(clientes, f, ensure_ascii=False, indent=4)
-                f.close()
-                print(f"Cliente {documento} modificado exitosamente.")
-            else:
-                print(f"Cliente {documento} no modificado.")
-    
-    except(FileNotFoundError, OSError) as error:
-        print("Error al intentar abrir archivo(s):", error)    
+            except Exception as e:
+                print(f"Error al validar fecha: {e}")
+                print("Fecha inválida. Intente nuevamente.")
+                nuevaFecha = leerCampo("Fecha de nacimiento (YYYY-MM-DD)", datos['fechaNacimiento'], parseString)
+        activoNuevo = leerCampo(
+            "¿Está activo? (True/False)",
+            "true" if datos["activo"] else "false",
+            parseString
+        )
+        datos["activo"] = activoNuevo.lower() == "true"
+
+        print(f"\nValor actualizado de cliente {documento}:\n")
+        mostrarCliente(datos, documento)
+        confirmacion = input("Ingrese 1 para confirmar, 0 para cancelar: ")
+        if confirmacion == "1":
+            if documento != documentoOriginal:
+                del clientes[documentoOriginal]
+                marcarModificado(archivo, documentoOriginal)
+            clientes[documento] = datos
+            marcarModificado(archivo, documento)
+            print(f"Cliente {documento} modificado exitosamente.")
+        else:
+            print(f"Cliente {documento} no modificado.")
+
+
+def normalizarColores(colores):
+    '''
+    Lleva los colores de un accesorio a la forma en que se guardan: {"color1": ..., "color2": ...}.
+    Acepta ese mismo diccionario, una lista de colores o un texto separado por comas.
 
+    Args:
+        colores (dict | list | str | None): Colores del accesorio.
+
+    Returns:
+        dict: Colores numerados a partir de color1 (vacío si no hay ninguno).
+    '''
+    if not colores:
+        return {}
+    if isinstance(colores, dict):
+        return colores
+    if isinstance(colores, str):
+        colores = colores.split(',')
+    return {f'color{i+1}': str(color).strip() for i, color in enumerate(colores)}
 
 def altaAccesorio(archivo,accesorios,codigo,nombre, descripcion, stock, precioUnitario, colores=None, activo=True):
     '''
@@ -382,107 +1092,146 @@ def altaAccesorio(archivo,accesorios,codigo,nombre, descripcion, stock, precioUn
 
     Args:
         archivo (str): Ruta al archivo JSON donde se almacenan los accesorios.
-        accesorios (dict): Diccionario con todos los accesorios existentes.
+        accesorios (dict): Diccionario residente con todos los accesorios (ver obtenerDatos).
         codigo (str): Código único del accesorio a agregar.
         nombre (str): Nombre del accesorio.
         descripcion (str): Descripción del accesorio.
         stock (int): Cantidad disponible en stock.
         precioUnitario (float): Precio unitario del accesorio.
-        colores (list, optional): Lista de colores disponibles. Por defecto es una lista vacía.
+        colores (dict | list, optional): Colores disponibles, como diccionario {"color1": ...} o lista
+            (ver normalizarColores). Por defecto no hay colores.
         activo (bool, optional): Estado del accesorio (activo o no). Por defecto es True.
 
     Returns:
         None
 
     '''
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        accesorio = json.load(f)
-        f.close()
-
-        if colores is None:
-            colores = []
-        
-        accesorio = {
-            'activo': activo,
-            'nombre': nombre,
-            'descripcion': descripcion,
-            'stock': stock,
-            'precioUnitario': precioUnitario,
-            'colores': colores
-            }
-        accesorios[codigo] = accesorio
-        
-        f = open(archivo, mode='w', encoding='utf-8')
-        json.dump(accesorios, f, ensure_ascii=False, indent=4)
-        f.close()
+    accesorio = {
+        'activo': activo,
+        'nombre': nombre,
+        'descripcion': descripcion,
+        'stock': stock,
+        'precioUnitario': precioUnitario,
+        'colores': normalizarColores(colores)
+        }
+    accesorios[codigo] = accesorio
+    marcarModificado(archivo, codigo)
 
-    except(FileNotFoundError, OSError) as detalle:
-        print("Error al intentar abrir archivo(s):", detalle)
+def registrarAccesorio(archivo, codigo, nombre, descripcion, stock, precioUnitario, colores=None, activo=True):
+    '''
+    Da de alta un accesorio si el código no existe (ver altaAccesorio).
+    Es la operación que usa el menú, tanto local como conectado a un servidor.
 
-def listarAccesorios(archivo):
+    Returns:
+        None
     '''
-    Lista todos los accesorios activos almacenados en el archivo JSON.
+    accesorios = obtenerDatos(archivo)
+    if codigo in accesorios:
+        print("El accesorio ya existe. No se puede agregar.")
+        return
+    altaAccesorio(archivo, accesorios, codigo, nombre, descripcion, stock, precioUnitario, colores, activo)
+    print("Accesorio agregado exitosamente.")
 
-    Args:
-        archivo (str): Ruta al archivo JSON donde se almacenan los accesorios.
+def construirIndiceAccesorios(accesorios):
+    '''
+    Construye la vista de accesorios activos: sus códigos en orden.
 
     Returns:
-        None 
+        dict: Índice con la clave activos (lista ordenada de códigos de accesorios activos).
     '''
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        accesorio = json.load(f)
-        f.close()
-
-        for codigo, accesorio in accesorio.items():
-            if accesorio['activo'] == False:
-                break
-            else:
-                print(f"Código: {codigo}")
-                print(f"Activo: {accesorio['activo']}")
-                print(f"Nombre: {accesorio['nombre']}")
-                print(f"Descripción: {accesorio['descripcion']}")
-                print(f"Stock: {accesorio['stock']}")
-                print(f"Precio Unitario: ${accesorio['precioUnitario']:.2f}")
-                print("Colores:")
-                for claveColor, valorColor in accesorio['colores'].items():
-                    print(f"  {claveColor}: {valorColor}")
-                print("-" * 40)
-    
-    except(FileNotFoundError, OSError) as detalle:
-        print("Error al intentar abrir archivo(s):", detalle)
+    return {"activos": sorted(codigo for codigo, accesorio in accesorios.items()
+                              if isinstance(accesorio, dict) and accesorio.get('activo', True))}
 
-def eliminarAccesorios(archivo,codigo):
+def indexarAccesorio(indice, codigo, accesorio):
     '''
-    Marca un accesorio como inactivo en el archivo, usando su código.
+    Actualiza la vista de accesorios activos con la versión actual de un accesorio.
+    Si el accesorio no existe (None) o está inactivo, se quita de la vista.
+    '''
+    activos = indice["activos"]
+    pos = bisect.bisect_left(activos, codigo)
+    incluido = pos < len(activos) and activos[pos] == codigo
+    activo = isinstance(accesorio, dict) and accesorio.get('activo', True)
+    if activo and not incluido:
+        activos.insert(pos, codigo)
+    elif incluido and not activo:
+        del activos[pos]
+
+def listarAccesorios(archivo, color=None, precioMin=None, precioMax=None, stockMin=None):
+    '''
+    Lista los accesorios activos, en orden de código, con una sola escritura.
+    Recorre solo la vista de accesorios activos (ver construirIndiceAccesorios).
 
     Args:
         archivo (str): Ruta al archivo JSON donde se almacenan los accesorios.
-        codigo (str): Código del accesorio a marcar como inactivo.
+        color (str, optional): Solo los accesorios que tengan ese color.
+        precioMin (float, optional): Precio unitario mínimo.
+        precioMax (float, optional): Precio unitario máximo.
+        stockMin (int, optional): Stock mínimo.
+
+    Returns:
+        None 
+    '''
+    accesorios = obtenerDatos(archivo)
+    color = normalizarTexto(color) if color else None
+
+    lineas = []
+    for codigo in obtenerRepositorio(archivo)["indice"]["activos"]:
+        accesorio = accesorios[codigo]
+        try:
+            precio = float(accesorio['precioUnitario'])
+            stock = int(accesorio['stock'])
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"Error en accesorio {codigo}: {e}")
+            continue
+        if precioMin is not None and precio < precioMin:
+            continue
+        if precioMax is not None and precio > precioMax:
+            continue
+        if stockMin is not None and stock < stockMin:
+            continue
+        colores = normalizarColores(accesorio.get('colores'))
+        if color is not None and color not in (normalizarTexto(c) for c in colores.values()):
+            continue
+
+        lineas.append(f"Código: {codigo}")
+        lineas.append(f"Activo: {accesorio['activo']}")
+        lineas.append(f"Nombre: {accesorio['nombre']}")
+        lineas.append(f"Descripción: {accesorio['descripcion']}")
+        lineas.append(f"Stock: {stock}")
+        lineas.append(f"Precio Unitario: ${precio:.2f}")
+        lineas.append("Colores:")
+        for claveColor, valorColor in colores.items():
+            lineas.append(f"  {claveColor}: {valorColor}")
+        lineas.append("-" * 40)
+
+    if not lineas:
+        print("No hay accesorios activos que mostrar.")
+        return
+    sys.stdout.write("\n".join(lineas) + "\n")
+    sys.stdout.flush()
+
+def eliminarAccesorios(archivo,codigo):
+    '''
+    Marca un accesorio como inactivo en el archivo, usando su código.
+
+    Args:
+        archivo (str): Ruta al archivo JSON donde se almacenan los accesorios.
+        codigo (str): Código del accesorio a marcar como inactivo.
 
     Returns:
         None
     '''
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        accesorios = json.load(f)
-        f.close()
+    accesorios = obtenerDatos(archivo)
 
-        if codigo in accesorios:
-            if accesorios[codigo]['activo'] == False:
-                print(f"El accesorio con código {codigo} ya estaba inactivo.")
-            else:
-                accesorios[codigo]['activo'] = False
-                f = open(archivo, mode='w', encoding='utf-8')
-                json.dump(accesorios, f, ensure_ascii=False, indent=4)
-                f.close()
-                print(f"Accesorio con código {codigo} marcado como inactivo.")
+    if codigo in accesorios:
+        if accesorios[codigo]['activo'] == False:
+            print(f"El accesorio con código {codigo} ya estaba inactivo.")
         else:
-            print(f"No se encontró un accesorio con el código {codigo}.")
-    
-    except (FileNotFoundError, OSError) as detalle:
-        print("Error al intentar abrir archivo(s):", detalle)
+            accesorios[codigo]['activo'] = False
+            marcarModificado(archivo, codigo)
+            print(f"Accesorio con código {codigo} marcado como inactivo.")
+    else:
+        print(f"No se encontró un accesorio con el código {codigo}.")
 
 def modificarAccesorio(archivo, codigo):
     '''
@@ -495,14 +1244,7 @@ def modificarAccesorio(archivo, codigo):
     Returns:
         None
     '''
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        accesorio = json.load(f)
-        f.close()
-
-    except (FileNotFoundError, OSError) as e:
-        print("No se pudo abrir el archivo:", e)
-        return
+    accesorio = obtenerDatos(archivo)
     
     if codigo in accesorio:
         datosActuales = accesorio[codigo]
@@ -548,11 +1290,11 @@ def modificarAccesorio(archivo, codigo):
             except ValueError:
                 print("Precio inválido. Ingrese un número positivo.")
 
-        coloresInput = input(f"Ingrese los colores del accesorio separados por coma (actual: {list(datosActuales['colores'].values())}): ")
+        coloresInput = input(f"Ingrese los colores del accesorio separados por coma (actual: {list(normalizarColores(datosActuales.get('colores')).values())}): ")
         if coloresInput == "":
-            colores = datosActuales['colores']
+            colores = normalizarColores(datosActuales.get('colores'))
         else:
-            colores = {f'color{i+1}': color.strip() for i, color in enumerate(coloresInput.split(','))}
+            colores = normalizarColores(coloresInput)
 
         accesorio[codigo] = {
             'activo': activo,
@@ -562,43 +1304,49 @@ def modificarAccesorio(archivo, codigo):
             'precioUnitario': precioUnitario,
             'colores': colores
         }
-        
-        try:
-            f = open(archivo, mode='w', encoding='utf-8')
-            json.dump(accesorio, f, ensure_ascii=False, indent=4)
-            f.close()
-            print(f"Accesorio con código {codigo} modificado exitosamente.")
-        except (FileNotFoundError, OSError) as e:
-            print("No se pudo guardar el archivo:", e)
+        marcarModificado(archivo, codigo)
+        print(f"Accesorio con código {codigo} modificado exitosamente.")
 
     else:
         print(f"No se encontró un accesorio con el código {codigo}.")
     return 
 
-def leerArchivo(archivo):
-    '''
-       Recibe el nombre de un archivo y devuelve el contenido del archivo en formato JSON.
-    '''
-    try:
-        f = open(archivo, mode='r', encoding='utf-8')
-        datos = json.load(f)
-        f.close()
-        return datos
-    except (FileNotFoundError, OSError) as e:
-        print("No se pudo abrir el archivo:", e)
-        return {}
+def celdaTabla(valor, ancho):
+    """
+    Ajusta un valor al ancho de su columna, recortándolo si es más largo.
+    """
+    if len(valor) > ancho:
+        valor = valor[:ancho - 1] + "…"
+    return valor.ljust(ancho)
 
+def mostrarTablaRenta(rentas, limite=None, desplazamiento=0, paginar=True, salida=None):
+    """
+    Muestra las rentas como tabla, recorriéndolas una sola vez.
+    - Los campos y anchos de columna se calculan con las primeras MUESTRA_ANCHOS_TABLA rentas
+      y se limitan a MAX_ANCHO_COLUMNA caracteres (los valores más largos se recortan).
+    - Las filas se escriben por páginas de FILAS_POR_PAGINA, con una sola escritura por página.
+    
+    Args:
+        rentas (dict): Diccionario con las rentas (o iterador de pares, ver iterarRentas)
+        limite (int, opcional): Cantidad máxima de rentas a mostrar. Si es None, se muestran todas.
+        desplazamiento (int): Cantidad de rentas a saltear al principio
+        paginar (bool): Si es True, pide ENTER para continuar entre páginas
+        salida (opcional): Archivo donde escribir. Por defecto, la salida estándar.
+    """
+    salida = salida or sys.stdout
+    filas = (par for par in paresRentas(rentas) if isinstance(par[1], (dict, Renta)))
+    fin = None if limite is None else desplazamiento + limite
+    filas = itertools.islice(filas, desplazamiento, fin)
 
-def mostrarTablaRenta(rentas):
-    if not rentas:
+    muestra = list(itertools.islice(filas, MUESTRA_ANCHOS_TABLA))
+    if not muestra:
         print("No hay rentas que mostrar.")
         return
 
-    # Extraer todas las claves de campos posibles
+    # Extraer las claves de campos de la muestra
     campos = set()
-    for datos in rentas.values():
-        if isinstance(datos, dict):
-            campos.update(datos.keys())
+    for _, datos in muestra:
+        campos.update(datos.keys())
 
     campos = sorted(campos)  # orden alfabético para consistencia
 
@@ -606,350 +1354,2259 @@ def mostrarTablaRenta(rentas):
     encabezado = ["ID"] + campos
     anchos = {campo: len(campo) for campo in encabezado}
 
-    # Calcular anchos máximos por columna
-    for id_renta, datos in rentas.items():
-        if not isinstance(datos, dict):
-            continue
+    # Calcular anchos por columna con la muestra, con un máximo
+    for id_renta, datos in muestra:
         anchos["ID"] = max(anchos["ID"], len(str(id_renta)))
         for campo in campos:
             valor = str(datos.get(campo, ""))
             anchos[campo] = max(anchos[campo], len(valor))
+    for campo in encabezado:
+        if campo not in COLUMNAS_SIN_RECORTE:
+            anchos[campo] = min(anchos[campo], max(MAX_ANCHO_COLUMNA, len(campo)))
+
+    fila_encabezado = " | ".join(celdaTabla(campo, anchos[campo]) for campo in encabezado)
+    lineas = [fila_encabezado, "-" * len(fila_encabezado)]
+
+    # Cada renta como fila; la página se escribe completa antes de empezar la siguiente
+    for numero, (id_renta, datos) in enumerate(itertools.chain(muestra, filas)):
+        if numero and numero % FILAS_POR_PAGINA == 0:
+            salida.write("\n".join(lineas) + "\n")
+            salida.flush()
+            lineas = []
+            if paginar and input("ENTER para ver más rentas, 'q' para terminar: ").strip().lower() == "q":
+                return
+        fila = [celdaTabla(str(id_renta), anchos["ID"])]
+        for campo in campos:
+            fila.append(celdaTabla(str(datos.get(campo, "")), anchos[campo]))
+        lineas.append(" | ".join(fila))
 
-    # Imprimir encabezado
-    fila_encabezado = " | ".join(campo.ljust(anchos[campo]) for campo in encabezado)
-    print(fila_encabezado)
-    print("-" * len(fila_encabezado))
+    salida.write("\n".join(lineas) + "\n")
+    salida.flush()
 
-    # Imprimir cada renta como fila
-    for id_renta, datos in rentas.items():
-        if not isinstance(datos, dict):
-            continue
-        fila = [str(id_renta).ljust(anchos["ID"])]
-        for campo in campos:
-            valor = str(datos.get(campo, ""))
-            fila.append(valor.ljust(anchos[campo]))
-        print(" | ".join(fila))
 
 
 
+class Renta:
+    """
+    Renta en memoria, con los campos ya convertidos a su tipo: dias y cantidad (int),
+    total y deposito (float), e inicio y devolucion (datetime, tomados del idRenta y de la
+    fecha de devolución). Así los informes no vuelven a convertirlos en cada recorrido.
+    Usa __slots__ para ocupar menos memoria que un diccionario por renta.
+
+    Se puede leer como el diccionario del archivo (renta["fecha Devolucion"], renta.get("estado"),
+    dict(renta)); para guardarla se convierte con aDict, que devuelve el mismo formato de siempre.
+    Los campos que no son de CAMPOS_RENTA (por ejemplo los del cierre) se guardan en extras.
+    Un campo que falta en el archivo no tiene valor (leerlo con get devuelve el valor por defecto);
+    uno que no se puede convertir conserva el valor leído.
+    """
+    __slots__ = ("idRenta", "idCliente", "dias", "fechaDevolucion", "total", "deposito",
+                 "estado", "metodoPago", "idAccesorio", "cantidad", "inicio", "devolucion", "extras")
+
+    @staticmethod
+    def desdeDict(datos):
+        """
+        Crea una Renta a partir del diccionario guardado en el archivo.
+        """
+        renta = Renta()
+        renta.extras = None
+        for clave, valor in datos.items():
+            atributo = CAMPOS_RENTA.get(clave)
+            if atributo is None:
+                if renta.extras is None:
+                    renta.extras = {}
+                renta.extras[clave] = valor
+                continue
+            try:
+                if atributo in ("dias", "cantidad"):
+                    valor = int(valor)
+                elif atributo in ("total", "deposito"):
+                    valor = float(valor)
+            except (ValueError, TypeError):
+                pass # Se conserva el valor leído
+            setattr(renta, atributo, valor)
+        renta.inicio = fechaHoraRenta(datos.get("idRenta"))
+        renta.devolucion = fechaHoraRenta(datos.get("fecha Devolucion"))
+        return renta
+
+    def aDict(self):
+        """
+        Devuelve la renta con el formato del archivo (cantidad como texto, como siempre se guardó).
+        """
+        datos = {}
+        for clave, atributo in CAMPOS_RENTA.items():
+            try:
+                valor = getattr(self, atributo)
+            except AttributeError:
+                continue
+            datos[clave] = str(valor) if atributo == "cantidad" else valor
+        if self.extras:
+            datos.update(self.extras)
+        return datos
+
+    def __getitem__(self, clave):
+        atributo = CAMPOS_RENTA.get(clave)
+        if atributo is None:
+            if self.extras and clave in self.extras:
+                return self.extras[clave]
+            raise KeyError(clave)
+        try:
+            valor = getattr(self, atributo)
+        except AttributeError:
+            raise KeyError(clave)
+        return str(valor) if atributo == "cantidad" else valor
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def __contains__(self, clave):
+        return self.get(clave, self) is not self
+
+    def keys(self):
+        return self.aDict().keys()
+
+    def items(self):
+        return self.aDict().items()
+
+    def __eq__(self, otra):
+        if isinstance(otra, (Renta, dict)):
+            return self.aDict() == dict(otra)
+        return NotImplemented
 
-def filtrarRentasPorMes(rentas, mes):
+    def __repr__(self):
+        return f"Renta({self.aDict()!r})"
+
+def aRenta(valor):
     """
-    Filtra las rentas por un mes específico (1-12).
-    
+    Convierte a Renta una renta leída (diccionario). Otros valores (None, datos dañados) no cambian.
+    """
+    return Renta.desdeDict(valor) if isinstance(valor, dict) else valor
+
+def fechaHoraRenta(texto):
+    """
+    Convierte una fecha con formato YYYY.MM.DD.HH.MM.SS (lo que sigue, como en los idRenta
+    de generarIdRenta, se ignora) en datetime, o None si no es válida.
+    """
+    try:
+        return datetime(*(int(parte) for parte in texto.split(".")[:6]))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def generarIdRenta():
+    """
+    Genera un idRenta único sin esperar a que cambie el segundo:
+    YYYY.MM.DD.HH.MM.SS.microsegundos.pid
+    - Empieza con la fecha y hora, como los idRenta anteriores, por lo que se sigue
+      ordenando por tiempo y parsearFechaRenta lo sigue entendiendo.
+    - Dentro del proceso los microsegundos siempre avanzan (si dos rentas caen en el mismo
+      microsegundo, la segunda usa el siguiente), así que no se repiten.
+    - El pid del proceso evita choques entre mostradores que generan al mismo tiempo.
+    Returns:
+        str: idRenta nuevo.
+    """
+    micro = max(time.time_ns() // 1000, GENERADOR_ID_RENTA["ultimo"] + 1)
+    GENERADOR_ID_RENTA["ultimo"] = micro
+    segundos, resto = divmod(micro, 1000000)
+    return f"{datetime.fromtimestamp(segundos).strftime('%Y.%m.%d.%H.%M.%S')}.{resto:06d}.{os.getpid()}"
+
+def parsearFechaRenta(idRenta):
+    """
+    Convierte el idRenta (formato: YYYY.MM.DD.HH.MM.SS, opcionalmente seguido de
+    .microsegundos.pid, ver generarIdRenta) en una tupla de enteros.
+    Returns:
+        tuple: (anio, mes, dia)
+    """
+    fechaParts = idRenta.split('.')
+    return int(fechaParts[0]), int(fechaParts[1]), int(fechaParts[2])
+
+def indexarRenta(indice, clave, renta):
+    """
+    Agrega una renta al índice de rentas (ver construirIndiceRentas).
+    Si la renta ya estaba indexada con otra fecha u otro cliente, la mueve de grupo.
+    """
+    if renta.inicio is None:
+        raise ValueError(f"idRenta inválido: {renta.get('idRenta')}")
+    fecha = (renta.inicio.year, renta.inicio.month, renta.inicio.day)
+    anterior = indice["fechas"].get(clave)
+    if anterior != fecha:
+        if anterior is not None:
+            indice["porMes"][(anterior[0], anterior[1])].remove(clave)
+        indice["fechas"][clave] = fecha
+        indice["porMes"].setdefault((fecha[0], fecha[1]), []).append(clave)
+
+    idCliente = renta.idCliente
+    clienteAnterior = indice["clientes"].get(clave)
+    if clave in indice["clientes"] and clienteAnterior == idCliente:
+        return
+    if clave in indice["clientes"]:
+        indice["porCliente"][clienteAnterior].remove(clave)
+    indice["clientes"][clave] = idCliente
+    indice["porCliente"].setdefault(idCliente, []).append(clave)
+
+def desindexarRenta(indice, clave):
+    """
+    Quita una renta del índice de rentas (ver construirIndiceRentas).
+    """
+    fecha = indice["fechas"].pop(clave, None)
+    if fecha is not None:
+        indice["porMes"][(fecha[0], fecha[1])].remove(clave)
+    if clave in indice["clientes"]:
+        indice["porCliente"][indice["clientes"].pop(clave)].remove(clave)
+
+def construirIndiceRentas(rentas):
+    """
+    Construye el índice de fechas y de clientes de las rentas, parseando cada idRenta una sola vez.
     Args:
         rentas (dict): Diccionario con todas las rentas
-        mes (int): Mes a filtrar (1-12)
-    
     Returns:
-        dict: Diccionario con las rentas del mes especificado
+        dict: Índice con las claves:
+              fechas  {clave: (anio, mes, dia)}
+              porMes  {(anio, mes): [claves de rentas]}
+              clientes  {clave: idCliente}
+              porCliente  {idCliente: [claves de rentas]}
     """
-    rentasFiltradas = {}
-    
+    indice = {"fechas": {}, "porMes": {}, "clientes": {}, "porCliente": {}}
     for key, datos in rentas.items():
         try:
-            # mes de idRenta (formato: YYYY.MM.DD.HH.MM.SS)
-            fechaParts = datos["idRenta"].split('.')
-            rentaMes = int(fechaParts[1])  # El mes es el segundo elemento
-            
-            if rentaMes == mes:
-                rentasFiltradas[key] = datos
+            indexarRenta(indice, key, datos)
         except Exception as e:
             print(f"Error en renta {key}: {e}")
-    
-    return rentasFiltradas
+    return indice
 
-def informeMesEspecifico(rentas):
+def paresRentas(rentas):
     """
-    Muestra un informe de rentas para un mes específico.
-    
-    Args:
-        rentas (dict): Diccionario con todas las rentas
+    Devuelve los pares (idRenta, renta) de `rentas`, que puede ser un diccionario
+    o un iterador de pares como el que devuelve iterarRentas.
     """
-    while True:
-        try:
-            print("\n--- Informe por Mes Específico ---")
-            mes = int(input("Ingrese el mes a consultar (1-12): "))
-            
-            if 1 <= mes <= 12:
-                rentasFiltradas = filtrarRentasPorMes(rentas, mes)
-                
-                if rentasFiltradas:
-                    print(f"\nRentas del mes {mes}:")
-                    mostrarTablaRenta(rentasFiltradas)
-                else:
-                    print(f"No hay rentas registradas en el mes {mes}.")
-                
-                break
-            else:
-                print("El mes debe estar entre 1 y 12. Intente nuevamente.")
-        except ValueError:
-            print("Por favor ingrese un número válido (1-12).")
+    if isinstance(rentas, dict):
+        return rentas.items()
+    return rentas
 
+def obtenerIndiceRentas(rentas):
+    """
+    Devuelve el índice de rentas de `rentas`. Si son las rentas residentes,
+    usa el índice del repositorio (mantenido por registrarRenta); si no, lo construye.
+    """
+    repo = REPOSITORIOS.get(ARCHIVO_RENTAS)
+    if repo is not None and repo["datos"] is rentas:
+        return repo["indice"]
+    return construirIndiceRentas(rentas)
 
-def filtrarRentasMesActual(rentas):
+def intervaloRenta(renta):
     """
-    Filtra las rentas del mes actual.
-    
+    Días que una renta ocupa sus accesorios: desde el día del idRenta hasta el día
+    de la fecha de devolución (sin incluirlo). Ocupa al menos un día.
+    Returns:
+        tuple: (primer día, día de devolución), como ordinales de date.
+    """
+    inicio = renta.inicio.toordinal()
+    fin = renta.devolucion.toordinal()
+    return inicio, max(fin, inicio + 1)
+
+def construirReservas(rentas):
+    """
+    Construye el registro de reservas: cuántas unidades de cada accesorio
+    están ocupadas cada día por rentas abiertas (estado fuera de ESTADOS_CERRADOS).
     Args:
         rentas (dict): Diccionario con todas las rentas
-    
     Returns:
-        dict: Diccionario con las rentas del mes actual
+        dict: Reservas con las claves:
+              porAccesorio  {idAccesorio: {día (ordinal): unidades reservadas}}
+              rentas  {clave: (idAccesorio, primer día, día de devolución, cantidad, fecha Devolucion)}
+              inicios  lista ordenada de (primer día, clave), para buscar por período
+              duracionMax  mayor duración en días de una reserva (cota para buscar por período)
+              vencimientos  lista ordenada de (fecha Devolucion, clave), para buscar rentas vencidas
     """
-    rentasFiltradas = {}
-    mesActual = datetime.now().month  # Obtenemos el mes actual (1-12)
-    
+    reservas = {"porAccesorio": {}, "rentas": {}, "inicios": [], "duracionMax": 0, "vencimientos": []}
     for key, datos in rentas.items():
-        try:
-            # Extraemos el mes de idRenta (formato: YYYY.MM.DD.HH.MM.SS)
-            fechaParts = datos["idRenta"].split('.')
-            rentaMes = int(fechaParts[1])  # El mes es el segundo elemento
-            
-            if rentaMes == mesActual:
-                rentasFiltradas[key] = datos
-        except Exception as e:
-            print(f"Error en renta {key}: {e}")
-    
-    return rentasFiltradas
+        reservarRenta(reservas, key, datos)
+    return reservas
 
-def informeMesActual(rentas):
+def reservarRenta(reservas, clave, renta):
     """
-    Muestra un informe de rentas para el mes actual.
-    
+    Actualiza las reservas con la versión actual de una renta: libera lo que reservaba
+    antes y reserva de nuevo si sigue abierta. renta=None indica que fue eliminada.
+    Una renta abierta con cantidad no positiva se informa y no reserva nada: restaría
+    unidades y el accesorio parecería más disponible.
+    """
+    anterior = reservas["rentas"].pop(clave, None)
+    if anterior is not None:
+        idAccesorio, inicio, fin, cantidad, vencimiento = anterior
+        dias = reservas["porAccesorio"][idAccesorio]
+        for dia in range(inicio, fin):
+            dias[dia] -= cantidad
+            if not dias[dia]:
+                del dias[dia]
+        del reservas["inicios"][bisect.bisect_left(reservas["inicios"], (inicio, clave))]
+        del reservas["vencimientos"][bisect.bisect_left(reservas["vencimientos"], (vencimiento, clave))]
+
+    if renta is None or str(renta.get("estado", "")).strip().lower() in ESTADOS_CERRADOS:
+        return
+    try:
+        inicio, fin = intervaloRenta(renta)
+        cantidad = renta.cantidad
+        idAccesorio = renta.idAccesorio
+        vencimiento = renta.fechaDevolucion
+        if not isinstance(cantidad, int) or cantidad <= 0:
+            raise ValueError(f"cantidad inválida: {cantidad}")
+    except (AttributeError, ValueError) as e:
+        print(f"Error en renta {clave}: {e}")
+        return
+    dias = reservas["porAccesorio"].setdefault(idAccesorio, {})
+    for dia in range(inicio, fin):
+        dias[dia] = dias.get(dia, 0) + cantidad
+    reservas["rentas"][clave] = (idAccesorio, inicio, fin, cantidad, vencimiento)
+    bisect.insort(reservas["inicios"], (inicio, clave))
+    bisect.insort(reservas["vencimientos"], (vencimiento, clave))
+    # La cota no se reduce al liberar reservas: solo amplía un poco la búsqueda
+    reservas["duracionMax"] = max(reservas["duracionMax"], fin - inicio)
+
+def rentasRetenidas(reservas, hoy):
+    """
+    Rentas abiertas cuyo día de devolución ya llegó (hoy o antes) y que todavía no se devolvieron.
+    Sus unidades siguen ocupadas desde ese día hasta que la renta se cierra (ver cerrarRenta),
+    así que no se pueden volver a rentar. Se buscan en la lista ordenada de vencimientos.
     Args:
-        rentas (dict): Diccionario con todas las rentas
+        reservas (dict): Registro de reservas (ver construirReservas).
+        hoy (int): Día actual, como ordinal de date.
+    Returns:
+        list: (idAccesorio, día de devolución, cantidad) de cada renta retenida.
     """
-    rentasFiltradas = filtrarRentasMesActual(rentas)
-    mesActual = datetime.now().month
-    
-    if rentasFiltradas:
-        print(f"\nRentas del mes actual ({mesActual}):")
-        mostrarTablaRenta(rentasFiltradas)
+    limite = date.fromordinal(hoy + 1).strftime("%Y.%m.%d")
+    ultimo = bisect.bisect_left(reservas["vencimientos"], (limite, ""))
+    retenidas = []
+    for _, clave in reservas["vencimientos"][:ultimo]:
+        idAccesorio, _, fin, cantidad, _ = reservas["rentas"][clave]
+        if fin <= hoy:
+            retenidas.append((idAccesorio, fin, cantidad))
+    return retenidas
+
+def unidadesReservadas(reservas, idAccesorio, desde, hasta, hoy=None):
+    """
+    Máximo de unidades de un accesorio reservadas en algún día del período [desde, hasta).
+    Las rentas vencidas que siguen abiertas ocupan sus unidades en todos los días desde
+    su devolución (ver rentasRetenidas).
+    Args:
+        desde, hasta (int): Días como ordinales de date.
+        hoy (int, opcional): Día actual como ordinal. Por defecto, el de hoy.
+    """
+    hoy = date.today().toordinal() if hoy is None else hoy
+    retenidas = sorted((fin, cantidad) for codigo, fin, cantidad in rentasRetenidas(reservas, hoy)
+                       if codigo == idAccesorio)
+    dias = reservas["porAccesorio"].get(idAccesorio) or {}
+
+    def retenidasHasta(dia):
+        return sum(cantidad for fin, cantidad in retenidas if fin <= dia)
+
+    # Las retenidas solo aumentan día a día: fuera de los días con reservas, el máximo es el último día
+    maximo = retenidasHasta(hasta - 1) + dias.get(hasta - 1, 0) if retenidas else 0
+    if hasta - desde <= len(dias):
+        reservados = ((dia, dias.get(dia, 0)) for dia in range(desde, hasta))
     else:
-        print(f"No hay rentas registradas en el mes actual ({mesActual}).")
+        reservados = ((dia, unidades) for dia, unidades in dias.items() if desde <= dia < hasta)
+    for dia, unidades in reservados:
+        maximo = max(maximo, unidades + (retenidasHasta(dia) if retenidas else 0))
+    return maximo
 
-
-def recuentoAccesoriosPorMes(rentas):
+def disponibilidadAccesorio(idAccesorio, desde, hasta):
     """
-    Genera un recuento de accesorios rentados por mes.
-    
+    Unidades de un accesorio libres durante todo el período, descontando las rentas abiertas
+    (también las vencidas que todavía no se devolvieron, ver rentasRetenidas).
+    El stock del accesorio es la cantidad total de unidades; no se descuenta al rentar.
     Args:
-        rentas (dict): Diccionario con todas las rentas
-    
+        idAccesorio (str): Código del accesorio.
+        desde (date): Primer día del período.
+        hasta (date): Día de devolución (no incluido). Si no es posterior a desde, se toma un día.
     Returns:
-        dict: Diccionario con el formato {idAccesorio: {mes: cantidad_total}}
+        int: Unidades disponibles, o None si el accesorio no existe o está inactivo.
     """
-    recuento = {}
-    
-    for renta in rentas.values():
+    accesorios = obtenerDatos("accesorios.json")
+    obtenerDatos(ARCHIVO_RENTAS) # Incorpora las rentas de otros procesos
+    accesorio = accesorios.get(idAccesorio)
+    if accesorio is None or not accesorio.get("activo", True):
+        return None
+    inicio = desde.toordinal()
+    fin = max(hasta.toordinal(), inicio + 1)
+    reservadas = unidadesReservadas(obtenerRepositorio(ARCHIVO_RENTAS)["reservas"], idAccesorio, inicio, fin)
+    return max(int(accesorio.get("stock", 0)) - reservadas, 0)
+
+def reservasCatalogo(reservas, desde, hasta, hoy=None):
+    """
+    Máximo de unidades reservadas de cada accesorio en algún día del período [desde, hasta),
+    con una sola consulta para todo el catálogo:
+    - las reservas que se superponen con el período empiezan entre desde - duracionMax y hasta,
+      y se ubican con búsqueda binaria en la lista ordenada de inicios;
+    - las rentas vencidas que siguen abiertas ocupan además sus unidades desde su devolución
+      hasta el final del período (ver rentasRetenidas);
+    - se recorren sus inicios y devoluciones en orden (barrido) acumulando las unidades por accesorio.
+    El tiempo depende de las reservas del período, no del total de rentas ni de accesorios.
+    Args:
+        desde, hasta (int): Días como ordinales de date.
+        hoy (int, opcional): Día actual como ordinal. Por defecto, el de hoy.
+    Returns:
+        dict: {idAccesorio: unidades reservadas} (solo los accesorios con reservas en el período).
+    """
+    inicios = reservas["inicios"]
+    primero = bisect.bisect_left(inicios, (desde - reservas["duracionMax"], ""))
+    ultimo = bisect.bisect_left(inicios, (hasta, ""))
+
+    eventos = []
+    for _, clave in inicios[primero:ultimo]:
+        idAccesorio, inicio, fin, cantidad, _ = reservas["rentas"][clave]
+        if fin <= desde:
+            continue
+        eventos.append((max(inicio, desde), cantidad, idAccesorio))
+        eventos.append((min(fin, hasta), -cantidad, idAccesorio))
+    for idAccesorio, fin, cantidad in rentasRetenidas(reservas, date.today().toordinal() if hoy is None else hoy):
+        if max(fin, desde) < hasta:
+            eventos.append((max(fin, desde), cantidad, idAccesorio))
+            eventos.append((hasta, -cantidad, idAccesorio))
+    eventos.sort() # En un mismo día, las devoluciones (negativas) antes que los inicios
+
+    actuales = {}
+    maximos = {}
+    for _, cantidad, idAccesorio in eventos:
+        actuales[idAccesorio] = actuales.get(idAccesorio, 0) + cantidad
+        if actuales[idAccesorio] > maximos.get(idAccesorio, 0):
+            maximos[idAccesorio] = actuales[idAccesorio]
+    return maximos
+
+def disponibilidadCatalogo(desde, hasta):
+    """
+    Unidades libres de cada accesorio activo durante todo el período (ver reservasCatalogo).
+    Args:
+        desde (date): Primer día del período.
+        hasta (date): Día de devolución (no incluido). Si no es posterior a desde, se toma un día.
+    Returns:
+        dict: {idAccesorio: (stock, unidades reservadas, unidades disponibles)}, en orden de código.
+    """
+    accesorios = obtenerDatos("accesorios.json")
+    obtenerDatos(ARCHIVO_RENTAS) # Incorpora las rentas de otros procesos
+    inicio = desde.toordinal()
+    fin = max(hasta.toordinal(), inicio + 1)
+    reservadas = reservasCatalogo(obtenerRepositorio(ARCHIVO_RENTAS)["reservas"], inicio, fin)
+
+    disponibilidad = {}
+    for codigo in obtenerRepositorio("accesorios.json")["indice"]["activos"]:
         try:
-            # Extraer mes de idRenta (formato: YYYY.MM.DD.HH.MM.SS)
-            mes = int(renta["idRenta"].split('.')[1])
-            idAccesorio = renta["idAccesorio"]
-            cantidad = int(renta["cantidad"])
-            
-            # Inicializar estructura si no existe
-            if idAccesorio not in recuento:
-                recuento[idAccesorio] = {m: 0 for m in range(1, 13)}
-            
-            recuento[idAccesorio][mes] += cantidad
-            
-        except Exception as e:
-            print(f"Error procesando renta {renta.get('idRenta', '')}: {e}")
-    
-    return recuento
+            stock = int(accesorios[codigo].get("stock", 0))
+        except (ValueError, TypeError) as e:
+            print(f"Error en accesorio {codigo}: {e}")
+            continue
+        ocupadas = reservadas.get(codigo, 0)
+        disponibilidad[codigo] = (stock, ocupadas, max(stock - ocupadas, 0))
+    return disponibilidad
 
-def mostrarRecuentoAccesorios(recuento):
+def informeDisponibilidadCatalogo(desde, hasta):
     """
-    Muestra el recuento de accesorios por mes en formato horizontal.
+    Muestra, para cada accesorio activo, cuántas unidades están libres entre dos fechas.
+    Args:
+        desde, hasta (str): Fechas YYYY-MM-DD (hasta es el día de devolución).
     """
-    if not recuento:
-        print("No hay datos de accesorios para mostrar.")
+    accesorios = obtenerDatos("accesorios.json")
+    desde = datetime.strptime(desde, "%Y-%m-%d").date()
+    hasta = datetime.strptime(hasta, "%Y-%m-%d").date()
+    disponibilidad = disponibilidadCatalogo(desde, hasta)
+    if not disponibilidad:
+        print("No hay accesorios activos.")
         return
 
-    meses = list(range(1, 13))
-    encabezado = ["idAccesorio"] + [f"Mes {m}" for m in meses]
-    anchos = {h: len(h) for h in encabezado}
+    lineas = [f"Disponibilidad del {desde} al {hasta}:",
+              f"{'Código':<8} | {celdaTabla('Nombre', MAX_ANCHO_COLUMNA)} | {'Stock':>6} | {'Rentadas':>8} | {'Libres':>6}"]
+    lineas.append("-" * len(lineas[1]))
+    for codigo, (stock, ocupadas, libres) in disponibilidad.items():
+        nombre = celdaTabla(str(accesorios[codigo].get("nombre", "")), MAX_ANCHO_COLUMNA)
+        lineas.append(f"{celdaTabla(codigo, 8)} | {nombre} | {stock:>6} | {ocupadas:>8} | {libres:>6}")
+    sys.stdout.write("\n".join(lineas) + "\n")
+    sys.stdout.flush()
 
-    # Calcular anchos
-    for idAcc, conteos in recuento.items():
-        anchos["idAccesorio"] = max(anchos["idAccesorio"], len(str(idAcc)))
-        for mes in meses:
-            val = str(conteos.get(mes, 0))
-            anchos[f"Mes {mes}"] = max(anchos[f"Mes {mes}"], len(val))
+def cerrarRenta(idRenta, estado, retencion=0.0):
+    """
+    Cierra una renta abierta: cambia su estado, registra la fecha de cierre y liquida
+    el depósito (se devuelve el depósito menos lo retenido). Al cerrarse, sus unidades
+    quedan libres (ver reservarRenta). Es el camino común de devolverRenta y cancelarRenta.
+    Args:
+        idRenta (str): Clave de la renta.
+        estado (str): Estado de cierre, uno de ESTADOS_CERRADOS.
+        retencion (float): Parte del depósito que no se devuelve (daños, atraso, etc.).
+    Returns:
+        bool: True si la renta se cerró.
+    """
+    with bloqueoArchivo(ARCHIVO_RENTAS):
+        rentas = cargarAniosRentas([anioRenta(idRenta)])
+        if idRenta not in rentas:
+            print(f"No se encontró la renta {idRenta}.")
+            return False
+        renta = dict(rentas[idRenta]) # Copia: la renta residente cambia al registrarla
+        if str(renta.get("estado", "")).strip().lower() in ESTADOS_CERRADOS:
+            print(f"La renta {idRenta} ya está cerrada ({renta['estado']}).")
+            return False
+        try:
+            deposito = float(renta.get("deposito", 0))
+        except (ValueError, TypeError):
+            print("Error al leer el depósito.")
+            return False
+        if not 0 <= retencion <= deposito:
+            print(f"La retención debe estar entre 0 y el depósito (${deposito:.2f}).")
+            return False
 
-    # Encabezado
-    print(" | ".join(h.ljust(anchos[h]) for h in encabezado))
-    print("-" * sum(anchos[h] + 3 for h in encabezado))
+        renta["estado"] = estado
+        renta["fecha Cierre"] = datetime.now().strftime("%Y.%m.%d.%H.%M.%S")
+        renta["depositoRetenido"] = retencion
+        renta["depositoDevuelto"] = deposito - retencion
+        if not registrarRenta(ARCHIVO_RENTAS, idRenta, renta):
+            return False
+    print(f"Renta {idRenta} {estado}. Depósito devuelto: ${deposito - retencion:.2f} (retenido: ${retencion:.2f}).")
+    return True
 
-    # Filas
-    for idAccesorio, conteos in recuento.items():
-        fila = [str(idAccesorio).ljust(anchos["idAccesorio"])]
-        for mes in meses:
-            val = str(conteos.get(mes, 0))
-            fila.append(val.ljust(anchos[f"Mes {mes}"]))
-        print(" | ".join(fila))
+def devolverRenta(idRenta, retencion=0.0):
+    """
+    Registra la devolución de los accesorios de una renta (estado "finalizado").
+    """
+    return cerrarRenta(idRenta, "finalizado", retencion)
 
+def cancelarRenta(idRenta):
+    """
+    Cancela una renta (estado "cancelado"); el depósito se devuelve completo.
+    """
+    return cerrarRenta(idRenta, "cancelado")
 
-def generarMatrizDineroPorMes(rentas, anio_filtrado=None):
+def rentasVencidas(ahora=None):
     """
-    Genera una matriz de depósitos por mes agrupada por accesorio.
-    
+    Rentas abiertas cuya fecha de devolución ya pasó, usando la lista ordenada de vencimientos:
+    el costo depende de la cantidad de rentas vencidas, no del total.
     Args:
-        rentas (dict): Diccionario con todas las rentas
-        anio_filtrado (int, opcional): Año a filtrar. Si es None, incluye todos.
-    
+        ahora (datetime, opcional): Momento de referencia. Por defecto, el actual.
     Returns:
-        tuple: (matriz, idAccesorios, meses)
+        dict: Rentas vencidas, de la más atrasada a la más reciente.
     """
-    idAccesorios = sorted(set(renta["idAccesorio"] for renta in rentas.values()))
-    meses = list(range(1, 13))
-    matriz = [[0 for _ in meses] for _ in idAccesorios]
-
-    for renta in rentas.values():
-        try:
-            fecha = renta["idRenta"].split('.')
-            anio = int(fecha[0])
-            mes = int(fecha[1])
+    rentas = obtenerDatos(ARCHIVO_RENTAS)
+    vencimientos = obtenerRepositorio(ARCHIVO_RENTAS)["reservas"]["vencimientos"]
+    limite = (ahora or datetime.now()).strftime("%Y.%m.%d.%H.%M.%S")
+    fin = bisect.bisect_left(vencimientos, (limite, ""))
+    return {clave: rentas[clave] for _, clave in vencimientos[:fin]}
 
-            if anio_filtrado and anio != anio_filtrado:
-                continue
-
-            idAccesorio = renta["idAccesorio"]
-            deposito = float(renta["deposito"])
-
-            fila = idAccesorios.index(idAccesorio)
-            columna = meses.index(mes)
+def informeRentasVencidas(paginar=True):
+    """
+    Muestra las rentas abiertas que ya debían haberse devuelto.
+    Args:
+        paginar (bool): Si es True, pide ENTER para continuar entre páginas
+    """
+    vencidas = rentasVencidas()
+    if not vencidas:
+        print("No hay rentas vencidas.")
+        return
+    print(f"\n{len(vencidas)} renta(s) vencida(s):")
+    mostrarTablaRenta(vencidas, paginar=paginar)
 
-            matriz[fila][columna] += deposito
+def pedirFecha(prompt):
+    """
+    Pide por consola una fecha (YYYY-MM-DD) hasta que sea válida.
+    Returns:
+        date: Fecha ingresada.
+    """
+    while True:
+        try:
+            return datetime.strptime(input(prompt).strip(), "%Y-%m-%d").date()
+        except ValueError:
+            print("Fecha inválida. Use el formato YYYY-MM-DD.")
 
-        except Exception as e:
-            print(f"Error procesando renta {renta.get('idRenta', '')}: {e}")
+def informeDisponibilidad(idAccesorio, desde, hasta):
+    """
+    Muestra cuántas unidades de un accesorio están libres entre dos fechas.
+    Args:
+        idAccesorio (str): Código del accesorio.
+        desde, hasta (str): Fechas YYYY-MM-DD (hasta es el día de devolución).
+    """
+    desde = datetime.strptime(desde, "%Y-%m-%d").date()
+    hasta = datetime.strptime(hasta, "%Y-%m-%d").date()
+    disponibles = disponibilidadAccesorio(idAccesorio, desde, hasta)
+    if disponibles is None:
+        print("ERROR: Accesorio no encontrado o inactivo.")
+        return
+    print(f"Accesorio {idAccesorio}: {disponibles} unidad(es) disponibles del {desde} al {hasta}.")
 
-    # Subtotales
-    subtotales = [sum(fila[mes] for fila in matriz) for mes in range(len(meses))]
-    matriz.append(subtotales)
-    idAccesorios.append("SUBTOTAL")
+def filtrarRentasPorMes(rentas, mes, anio):
+    """
+    Filtra las rentas de un mes (1-12) de un año.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+        mes (int): Mes a filtrar (1-12)
+        anio (int): Año del mes
+    
+    Returns:
+        dict: Diccionario con las rentas del mes especificado
+    """
+    repo = REPOSITORIOS.get(ARCHIVO_RENTAS)
+    if SQLITE["conexion"] is not None and repo is not None and repo["datos"] is rentas:
+        return consultarRentasPorMesSQLite(mes, anio)
 
-    return matriz, idAccesorios, meses
+    rentasFiltradas = {}
+    if not isinstance(rentas, dict):
+        for key, datos in rentas:
+            try:
+                if datos.inicio.month == mes and datos.inicio.year == anio:
+                    rentasFiltradas[key] = datos
+            except Exception as e:
+                print(f"Error en renta {key}: {e}")
+        return rentasFiltradas
+
+    # Solo se recorre el grupo (anio, mes) pedido
+    for key in obtenerIndiceRentas(rentas)["porMes"].get((anio, mes), ()):
+        rentasFiltradas[key] = rentas[key]
+    
+    return rentasFiltradas
 
+def pedirAnio():
+    """
+    Pide por consola un año hasta que sea válido. ENTER elige el año actual.
+    Returns:
+        int: Año ingresado.
+    """
+    while True:
+        texto = input("Ingrese el año (ENTER = año actual): ").strip()
+        if not texto:
+            return datetime.now().year
+        if texto.isdigit() and 1 <= int(texto) <= 9999:
+            return int(texto)
+        print("Por favor ingrese un año válido (ej: 2025).")
+
+def pedirAnios():
+    """
+    Pide por consola un año o un rango de años (ej: 2023-2025) hasta que sea válido.
+    ENTER elige el año actual.
+    Returns:
+        list: Años del rango, en orden.
+    """
+    while True:
+        texto = input("Ingrese el año o un rango de años (ej: 2025 o 2023-2025, ENTER = año actual): ").strip()
+        if not texto:
+            return [datetime.now().year]
+        partes = [parte.strip() for parte in texto.split("-")]
+        if len(partes) <= 2 and all(parte.isdigit() and 1 <= int(parte) <= 9999 for parte in partes):
+            desde, hasta = int(partes[0]), int(partes[-1])
+            if desde <= hasta:
+                return list(range(desde, hasta + 1))
+        print("Por favor ingrese un año (ej: 2025) o un rango válido (ej: 2023-2025).")
+
+def describirAnios(anios):
+    """
+    Devuelve el texto de un rango de años para los títulos de los informes. Ej: "2023-2025".
+    """
+    if len(anios) == 1:
+        return str(anios[0])
+    return f"{anios[0]}-{anios[-1]}"
+
+def pedirMes():
+    """
+    Pide por consola un mes (1-12) hasta que sea válido.
+    Returns:
+        int: Mes ingresado.
+    """
+    while True:
+        try:
+            mes = int(input("Ingrese el mes a consultar (1-12): "))
+            if 1 <= mes <= 12:
+                return mes
+            print("El mes debe estar entre 1 y 12. Intente nuevamente.")
+        except ValueError:
+            print("Por favor ingrese un número válido (1-12).")
+
+def informeMesEspecifico(rentas, mes=None, anio=None, paginar=True):
+    """
+    Muestra un informe de rentas para un mes específico.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas
+        mes (int, opcional): Mes a consultar (1-12). Si es None, se pide por consola.
+        anio (int, opcional): Año del mes. Si es None, se pide por consola.
+        paginar (bool): Si es True, pide ENTER para continuar entre páginas
+    """
+    print("\n--- Informe por Mes Específico ---")
+    if mes is None:
+        mes = pedirMes()
+    if anio is None:
+        anio = pedirAnio()
+    if not 1 <= mes <= 12:
+        print("El mes debe estar entre 1 y 12.")
+        return
+
+    rentasFiltradas = filtrarRentasPorMes(rentas, mes, anio)
+    if rentasFiltradas:
+        print(f"\nRentas del mes {mes}/{anio}:")
+        mostrarTablaRenta(rentasFiltradas, paginar=paginar)
+    else:
+        print(f"No hay rentas registradas en el mes {mes}/{anio}.")
+
+
+def filtrarRentasMesActual(rentas):
+    """
+    Filtra las rentas del mes actual.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas
+    
+    Returns:
+        dict: Diccionario con las rentas del mes actual
+    """
+    hoy = datetime.now()
+    return filtrarRentasPorMes(rentas, hoy.month, hoy.year)
+
+def informeMesActual(rentas, paginar=True):
+    """
+    Muestra un informe de rentas para el mes actual.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas
+        paginar (bool): Si es True, pide ENTER para continuar entre páginas
+    """
+    rentasFiltradas = filtrarRentasMesActual(rentas)
+    hoy = datetime.now()
+    
+    if rentasFiltradas:
+        print(f"\nRentas del mes actual ({hoy.month}/{hoy.year}):")
+        mostrarTablaRenta(rentasFiltradas, paginar=paginar)
+    else:
+        print(f"No hay rentas registradas en el mes actual ({hoy.month}/{hoy.year}).")
+
+
+def filtrarRentasCliente(rentas, idCliente):
+    """
+    Devuelve las rentas de un cliente. Con las rentas residentes usa el índice por cliente,
+    por lo que el tiempo depende de las rentas del cliente y no del total.
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+        idCliente (str): Documento del cliente
+    Returns:
+        dict: Diccionario con las rentas del cliente
+    """
+    repo = REPOSITORIOS.get(ARCHIVO_RENTAS)
+    if SQLITE["conexion"] is not None and repo is not None and repo["datos"] is rentas:
+        return consultarRentasClienteSQLite(idCliente)
+    if not isinstance(rentas, dict):
+        return {key: datos for key, datos in rentas if datos.get("idCliente") == idCliente}
+
+    indice = obtenerIndiceRentas(rentas)
+    return {key: rentas[key] for key in indice["porCliente"].get(idCliente, ())}
+
+def estadoCuentaCliente(rentas, idCliente):
+    """
+    Resume las rentas de un cliente.
+    Returns:
+        dict: Resumen con las claves:
+              rentas (dict con las rentas del cliente), total (importe de todas las rentas),
+              depositos (suma de depósitos), depositosPendientes (depósitos de rentas no cerradas)
+              y porEstado ({estado: [cantidad de rentas, total]}).
+    """
+    rentasCliente = filtrarRentasCliente(rentas, idCliente)
+    resumen = {"rentas": rentasCliente, "total": 0.0, "depositos": 0.0, "depositosPendientes": 0.0, "porEstado": {}}
+    for key, datos in rentasCliente.items():
+        total = datos.get("total", 0.0)
+        deposito = datos.get("deposito", 0.0)
+        if not isinstance(total, float) or not isinstance(deposito, float):
+            print(f"Error en renta {key}: total o depósito inválido")
+            continue
+        estado = str(datos.get("estado", "")).strip().lower()
+        resumen["total"] += total
+        resumen["depositos"] += deposito
+        if estado not in ESTADOS_CERRADOS:
+            resumen["depositosPendientes"] += deposito
+        acumulado = resumen["porEstado"].setdefault(estado, [0, 0.0])
+        acumulado[0] += 1
+        acumulado[1] += total
+    return resumen
+
+def informeEstadoCuenta(rentas, idCliente, paginar=True):
+    """
+    Muestra el estado de cuenta de un cliente: sus rentas, totales,
+    depósitos pendientes de devolución y el desglose por estado.
+    Args:
+        rentas (dict): Diccionario con todas las rentas
+        idCliente (str): Documento del cliente
+        paginar (bool): Si es True, pide ENTER para continuar entre páginas
+    """
+    resumen = estadoCuentaCliente(rentas, idCliente)
+    print(f"\n--- Estado de cuenta del cliente {idCliente} ---")
+    if not resumen["rentas"]:
+        print("El cliente no tiene rentas registradas.")
+        return
+
+    mostrarTablaRenta(resumen["rentas"], paginar=paginar)
+    lineas = [
+        "",
+        f"Rentas: {len(resumen['rentas'])}",
+        f"Total: ${resumen['total']:.2f}",
+        f"Depósitos: ${resumen['depositos']:.2f}",
+        f"Depósitos pendientes (rentas no {' ni '.join(ESTADOS_CERRADOS)}): ${resumen['depositosPendientes']:.2f}",
+        "Por estado:"
+    ]
+    for estado, (cantidad, total) in sorted(resumen["porEstado"].items()):
+        lineas.append(f"  {estado or '(sin estado)'}: {cantidad} renta(s), ${total:.2f}")
+    print("\n".join(lineas))
+
+def aplicarRentaEnAgregados(agregados, renta, fecha, signo=1):
+    """
+    Suma (signo=1) o resta (signo=-1) una renta en los agregados de informes.
+    Se usa al registrar una renta y al modificarla o anularla (restando la versión anterior).
+    
+    Args:
+        agregados (dict): Agregados (ver calcularAgregadosRentas)
+        renta (Renta): Datos de la renta
+        fecha (tuple): (anio, mes, dia) de la renta, tomada del índice de fechas
+        signo (int): 1 para sumar, -1 para restar
+    """
+    anio, mes, _ = fecha
+    if not isinstance(renta.cantidad, int) or not isinstance(renta.deposito, float) or not isinstance(renta.total, float):
+        raise ValueError("cantidad, depósito o total inválido")
+    cantidad = renta.cantidad * signo
+    deposito = renta.deposito * signo
+    total = renta.total * signo
+    grupo = (renta.idAccesorio, anio, mes)
+
+    acumulado = agregados["accesorios"].get(grupo)
+    if acumulado is None:
+        acumulado = agregados["accesorios"][grupo] = [0, 0, 0, 0]
+    acumulado[AGREGADO_CANTIDAD] += cantidad
+    acumulado[AGREGADO_DEPOSITO] += deposito
+    acumulado[AGREGADO_TOTAL] += total
+    acumulado[AGREGADO_RENTAS] += signo
+    if acumulado[AGREGADO_RENTAS] == 0:
+        del agregados["accesorios"][grupo]
+
+    depositosPorMes = agregados["depositosPorMes"]
+    depositosPorMes[(anio, mes)] = depositosPorMes.get((anio, mes), 0) + deposito
+
+    ingresosPorCliente = agregados["ingresosPorCliente"]
+    ingresosPorCliente[renta.idCliente] = ingresosPorCliente.get(renta.idCliente, 0) + total
+
+def calcularAgregadosRentas(rentas):
+    """
+    Recorre las rentas una sola vez y acumula todos los valores que usan los informes.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+    
+    Returns:
+        dict: Agregados con las claves:
+              accesorios          {(idAccesorio, anio, mes): [cantidad, deposito, total, cantidadRentas]}
+                                  (posiciones AGREGADO_CANTIDAD, AGREGADO_DEPOSITO, AGREGADO_TOTAL y AGREGADO_RENTAS)
+              depositosPorMes     {(anio, mes): deposito}
+              ingresosPorCliente  {idCliente: total}
+    """
+    agregados = {"accesorios": {}, "depositosPorMes": {}, "ingresosPorCliente": {}}
+    columnas = construirColumnasRentas(rentas)
+    accesorios = columnas["accesorios"]
+    clientes = columnas["clientes"]
+
+    grupos = sumarPorGrupo([columnas["accesorio"], columnas["anio"], columnas["mes"]],
+                           [columnas["cantidad"], columnas["deposito"], columnas["total"]])
+    for (accesorio, anio, mes), (cantidadRentas, cantidad, deposito, total) in grupos.items():
+        acumulado = [0, 0, 0, 0]
+        acumulado[AGREGADO_CANTIDAD] = cantidad
+        acumulado[AGREGADO_DEPOSITO] = deposito
+        acumulado[AGREGADO_TOTAL] = total
+        acumulado[AGREGADO_RENTAS] = cantidadRentas
+        agregados["accesorios"][(accesorios[accesorio], anio, mes)] = acumulado
+
+    for (anio, mes), (_, deposito) in sumarPorGrupo([columnas["anio"], columnas["mes"]], [columnas["deposito"]]).items():
+        agregados["depositosPorMes"][(anio, mes)] = deposito
+
+    for (cliente,), (_, total) in sumarPorGrupo([columnas["cliente"]], [columnas["total"]]).items():
+        agregados["ingresosPorCliente"][clientes[cliente]] = total
+
+    return agregados
+
+def construirColumnasRentas(rentas):
+    """
+    Arma una representación por columnas de las rentas con los campos que usan los informes:
+    cada columna es un array (módulo array) con un valor por renta, en el mismo orden.
+    Los códigos de accesorio y de cliente se codifican como índices de las listas
+    "accesorios" y "clientes", así las columnas son solo números.
+    Las rentas con datos inválidos se informan y no se incluyen.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+    
+    Returns:
+        dict: Columnas con las claves:
+              accesorios, clientes  listas de códigos (la posición es el código codificado)
+              accesorio, cliente    array('I') con el código codificado de cada renta
+              anio (array('H')), mes (array('B')), cantidad (array('q')), deposito y total (array('d'))
+    """
+    columnas = {
+        "accesorio": array("I"), "cliente": array("I"), "anio": array("H"), "mes": array("B"),
+        "cantidad": array("q"), "deposito": array("d"), "total": array("d")
+    }
+    codigosAccesorio = {}
+    codigosCliente = {}
+
+    for _, renta in paresRentas(rentas):
+        try:
+            anio = renta.inicio.year
+            mes = renta.inicio.month
+            if not isinstance(renta.cantidad, int) or not isinstance(renta.deposito, float) or not isinstance(renta.total, float):
+                raise ValueError("cantidad, depósito o total inválido")
+            idAccesorio = renta.idAccesorio
+            idCliente = renta.idCliente
+        except Exception as e:
+            print(f"Error procesando renta {renta.get('idRenta', '')}: {e}")
+            continue
+        columnas["accesorio"].append(codigosAccesorio.setdefault(idAccesorio, len(codigosAccesorio)))
+        columnas["cliente"].append(codigosCliente.setdefault(idCliente, len(codigosCliente)))
+        columnas["anio"].append(anio)
+        columnas["mes"].append(mes)
+        columnas["cantidad"].append(renta.cantidad)
+        columnas["deposito"].append(renta.deposito)
+        columnas["total"].append(renta.total)
+
+    columnas["accesorios"] = list(codigosAccesorio)
+    columnas["clientes"] = list(codigosCliente)
+    return columnas
+
+def sumarPorGrupo(claves, valores):
+    """
+    Agrupa las filas por las columnas `claves` y suma en cada grupo las columnas `valores`
+    (como un GROUP BY). Con NumPy las sumas son vectorizadas (bincount); sin NumPy
+    se recorren las columnas una vez.
+    
+    Args:
+        claves (list): Columnas de enteros no negativos que forman la clave del grupo
+        valores (list): Columnas a sumar (del mismo largo)
+    
+    Returns:
+        dict: {clave (tupla): [cantidad de filas, suma de cada columna de valores...]},
+              en el orden en que aparece cada grupo por primera vez.
+    """
+    if not claves or not len(claves[0]):
+        return {}
+
+    if np is None:
+        grupos = {}
+        largoClave = len(claves)
+        for fila in zip(*claves, *valores):
+            clave = fila[:largoClave]
+            acumulado = grupos.get(clave)
+            if acumulado is None:
+                acumulado = grupos[clave] = [0 for _ in range(len(valores) + 1)]
+            acumulado[0] += 1
+            for i in range(len(valores)):
+                acumulado[i + 1] += fila[largoClave + i]
+        return grupos
+
+    # Cada clave se combina en un solo entero (base mixta) para agrupar con unique/bincount
+    columnasClave = [np.frombuffer(columna, dtype=columna.typecode).astype(np.int64) for columna in claves]
+    tamanios = [int(columna.max()) + 1 for columna in columnasClave]
+    grupo = np.zeros(len(columnasClave[0]), dtype=np.int64)
+    for columna, tamanio in zip(columnasClave, tamanios):
+        grupo = grupo * tamanio + columna
+    presentes, primeras, posiciones = np.unique(grupo, return_index=True, return_inverse=True)
+
+    sumas = [np.bincount(posiciones, minlength=len(presentes))]
+    for columna in valores:
+        suma = np.bincount(posiciones, weights=np.frombuffer(columna, dtype=columna.typecode), minlength=len(presentes))
+        sumas.append(suma if columna.typecode == "d" else np.rint(suma).astype(np.int64))
+
+    orden = np.argsort(primeras, kind="stable")
+    clavesGrupo = zip(*(partes[orden].tolist() for partes in np.unravel_index(presentes, tamanios)))
+    filas = zip(*(suma[orden].tolist() for suma in sumas))
+    return {clave: list(fila) for clave, fila in zip(clavesGrupo, filas)}
+
+def obtenerAgregadosRentas(rentas):
+    """
+    Devuelve los agregados de `rentas` (ver calcularAgregadosRentas).
+    Para las rentas residentes se mantienen actualizados por registrarRenta y se guardan
+    en disco, así que los informes no vuelven a recorrer las rentas.
+    """
+    repo = REPOSITORIOS.get(ARCHIVO_RENTAS)
+    if repo is not None and repo["datos"] is rentas:
+        if repo["agregados"] is None and repo["aniosCargados"] is None:
+            repo["agregados"] = calcularAgregadosRentas(rentas)
+            repo["agregadosModificados"] = True
+        elif repo["agregados"] is None:
+            # Con años sin cargar se recorren los archivos. Bloqueadas y sincronizadas, las rentas
+            # guardadas son las residentes, así que los cambios siguientes se aplican bien
+            with bloqueoArchivo(ARCHIVO_RENTAS):
+                sincronizarRentas(repo)
+                repo["agregados"] = calcularAgregadosRentas(iterarRentas(ARCHIVO_RENTAS))
+            repo["agregadosModificados"] = True
+        return repo["agregados"]
+    return calcularAgregadosRentas(rentas)
+
+def calcularAgregadosParalelo(nombre_archivo, anios=None, procesos=None):
+    """
+    Calcula los agregados de informes (ver calcularAgregadosRentas) repartiendo los años
+    entre varios procesos: cada uno recorre el archivo de un año (ver agregadosDeAnio)
+    y después se suman los resultados parciales (ver combinarAgregados).
+    Con una base SQLite se calculan en este proceso (la conexión no se comparte entre procesos).
+    
+    Args:
+        nombre_archivo (str): Archivo de rentas
+        anios (list, opcional): Años a incluir. Si es None, todos los que tienen rentas.
+        procesos (int, opcional): Cantidad máxima de procesos. Si es None, uno por núcleo.
+    
+    Returns:
+        dict: Agregados (ver calcularAgregadosRentas)
+    """
+    if SQLITE["conexion"] is not None:
+        return calcularAgregadosRentas(iterarRentas(nombre_archivo, anios))
+
+    migrarRentasAParticiones(nombre_archivo)
+    if anios is None:
+        anios = set(aniosParticiones(nombre_archivo))
+        anios.update(anioRenta(idRenta) for idRenta, _ in leerEntradasJSONL(rutaDiarioRentas(nombre_archivo)))
+    anios = sorted(anios)
+    archivos = [nombre_archivo] * len(anios)
+    procesos = min(procesos or os.cpu_count() or 1, len(anios))
+
+    parciales = None
+    if procesos > 1:
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                parciales = list(ejecutor.map(agregadosDeAnio, archivos, anios))
+        except (OSError, concurrent.futures.process.BrokenProcessPool) as e:
+            print(f"No se pudieron usar varios procesos ({e}); se calcula en este proceso.")
+    if parciales is None:
+        parciales = map(agregadosDeAnio, archivos, anios)
+
+    agregados = {"accesorios": {}, "depositosPorMes": {}, "ingresosPorCliente": {}}
+    for parcial in parciales:
+        combinarAgregados(agregados, parcial)
+    return agregados
+
+def agregadosDeAnio(nombre_archivo, anio):
+    """
+    Calcula los agregados de informes de las rentas de un año (archivo del año más su parte
+    del diario). Es lo que ejecuta cada proceso en calcularAgregadosParalelo.
+    """
+    return calcularAgregadosRentas(iterarRentas(nombre_archivo, [anio]))
+
+def combinarAgregados(agregados, parcial):
+    """
+    Suma sobre `agregados` los agregados parciales de otro grupo de rentas (por ejemplo, de otro año).
+    """
+    for grupo, valores in parcial["accesorios"].items():
+        acumulado = agregados["accesorios"].get(grupo)
+        if acumulado is None:
+            agregados["accesorios"][grupo] = list(valores)
+        else:
+            for posicion, valor in enumerate(valores):
+                acumulado[posicion] += valor
+
+    for clave in ("depositosPorMes", "ingresosPorCliente"):
+        acumulados = agregados[clave]
+        for grupo, valor in parcial[clave].items():
+            acumulados[grupo] = acumulados.get(grupo, 0) + valor
+
+def rutaAgregadosRentas(nombre_archivo):
+    """
+    Devuelve la ruta del archivo donde se guardan los agregados de informes.
+    Ej: "rentas.json" -> "rentas.agregados.json"
+    """
+    base, _ = os.path.splitext(nombre_archivo)
+    return base + ".agregados.json"
+
+def firmaRentas(nombre_archivo):
+    """
+    Identifica el estado de las rentas guardadas: tamaño y fecha de modificación de cada
+    archivo por año y del diario. Si cualquiera cambia, los agregados guardados ya no
+    corresponden a las rentas.
+    """
+    firma = []
+    rutas = [rutaParticionRentas(nombre_archivo, anio) for anio in aniosParticiones(nombre_archivo)]
+    for ruta in rutas + [rutaDiarioRentas(nombre_archivo)]:
+        try:
+            estado = os.stat(ruta)
+            firma += [estado.st_size, estado.st_mtime_ns]
+        except FileNotFoundError:
+            firma += [0, 0]
+    return firma
+
+def guardarAgregadosRentas(nombre_archivo, repo):
+    """
+    Guarda los agregados del repositorio de rentas junto con la firma de las rentas.
+    Las claves (tuplas) se guardan como "idAccesorio|anio|mes" y "anio|mes".
+    """
+    agregados = repo["agregados"]
+    if agregados is None:
+        return
+    contenido = {
+        "firma": firmaRentas(nombre_archivo),
+        "accesorios": {f"{a}|{anio}|{mes}": v for (a, anio, mes), v in agregados["accesorios"].items()},
+        "depositosPorMes": {f"{anio}|{mes}": v for (anio, mes), v in agregados["depositosPorMes"].items()},
+        "ingresosPorCliente": agregados["ingresosPorCliente"]
+    }
+    try:
+        escribirJSONAtomico(rutaAgregadosRentas(nombre_archivo), contenido)
+        repo["agregadosModificados"] = False
+    except OSError as e:
+        print("No se pudo guardar el archivo:", e)
+
+def cargarAgregadosRentas(nombre_archivo):
+    """
+    Carga los agregados guardados si corresponden a las rentas actuales.
+    Returns:
+        dict: Agregados (ver calcularAgregadosRentas) o None si no existen o están desactualizados.
+    """
+    try:
+        f = open(rutaAgregadosRentas(nombre_archivo), mode='r', encoding='utf-8')
+        contenido = json.load(f)
+        f.close()
+    except (OSError, json.JSONDecodeError):
+        return None
+    if contenido.get("firma") != firmaRentas(nombre_archivo):
+        return None
+
+    accesorios = {}
+    for clave, valores in contenido["accesorios"].items():
+        idAccesorio, anio, mes = clave.rsplit("|", 2)
+        accesorios[(idAccesorio, int(anio), int(mes))] = valores
+    depositosPorMes = {}
+    for clave, valor in contenido["depositosPorMes"].items():
+        anio, mes = clave.split("|")
+        depositosPorMes[(int(anio), int(mes))] = valor
+    return {
+        "accesorios": accesorios,
+        "depositosPorMes": depositosPorMes,
+        "ingresosPorCliente": contenido["ingresosPorCliente"]
+    }
+
+def recuentoAccesoriosPorMes(rentas, anios=None, agregados=None):
+    """
+    Genera un recuento de accesorios rentados por mes.
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+        anios (list, opcional): Años a incluir (se suman los meses de todos). Si es None, todos.
+        agregados (dict, opcional): Agregados ya calculados (ver calcularAgregadosParalelo).
+                                    Si se indican, no se recorren las rentas.
+    
+    Returns:
+        dict: Diccionario con el formato {idAccesorio: {mes: cantidad_total}}
+    """
+    posiciones = {} # idAccesorio -> fila, en el orden en que aparece cada accesorio
+    filas, meses, cantidades = array("q"), array("B"), array("q")
+    aniosPedidos = set(anios) if anios is not None else None
+    if agregados is None:
+        agregados = obtenerAgregadosRentas(rentas)
+
+    for (idAccesorio, anio, mes), acumulado in agregados["accesorios"].items():
+        if aniosPedidos is not None and anio not in aniosPedidos:
+            continue
+        filas.append(posiciones.setdefault(idAccesorio, len(posiciones)))
+        meses.append(mes)
+        cantidades.append(acumulado[AGREGADO_CANTIDAD])
+
+    matriz = matrizPorMes(filas, meses, cantidades, len(posiciones))
+    return {idAccesorio: dict(zip(range(1, 13), matriz[fila])) for idAccesorio, fila in posiciones.items()}
+
+def matrizPorMes(filas, meses, valores, cantidadFilas):
+    """
+    Suma valores en una matriz de cantidadFilas x 12 (una columna por mes) y agrega
+    al final la fila de subtotales. Con NumPy la suma es vectorizada (bincount sobre
+    el índice de cada celda, fila * 12 + mes - 1); sin NumPy se acumula en listas.
+    
+    Args:
+        filas (array): Fila de cada valor (array('q'))
+        meses (array): Mes (1 a 12) de cada valor (array('B'))
+        valores (array): Valores a sumar (array('q') o array('d'))
+        cantidadFilas (int): Filas de la matriz, sin contar la de subtotales
+    
+    Returns:
+        list: Matriz (lista de listas) de cantidadFilas + 1 filas; la última son los subtotales.
+    """
+    if np is not None and valores:
+        celdas = np.frombuffer(filas, dtype=filas.typecode) * 12 + np.frombuffer(meses, dtype=meses.typecode).astype(np.int64) - 1
+        sumas = np.bincount(celdas, weights=np.frombuffer(valores, dtype=valores.typecode), minlength=cantidadFilas * 12)
+        if valores.typecode != "d":
+            sumas = np.rint(sumas).astype(np.int64)
+        matriz = sumas.reshape(cantidadFilas, 12)
+        return matriz.tolist() + [matriz.sum(axis=0).tolist()]
+
+    matriz = [[0 for _ in range(12)] for _ in range(cantidadFilas)]
+    for fila, mes, valor in zip(filas, meses, valores):
+        matriz[fila][mes - 1] += valor
+    matriz.append([sum(columna) for columna in zip(*matriz)] if matriz else [0 for _ in range(12)])
+    return matriz
+
+def mostrarRecuentoAccesorios(recuento):
+    """
+    Muestra el recuento de accesorios por mes en formato horizontal.
+    """
+    if not recuento:
+        print("No hay datos de accesorios para mostrar.")
+        return
+
+    meses = list(range(1, 13))
+    encabezado = ["idAccesorio"] + [f"Mes {m}" for m in meses]
+    anchos = {h: len(h) for h in encabezado}
+
+    # Calcular anchos
+    for idAcc, conteos in recuento.items():
+        anchos["idAccesorio"] = max(anchos["idAccesorio"], len(str(idAcc)))
+        for mes in meses:
+            val = str(conteos.get(mes, 0))
+            anchos[f"Mes {mes}"] = max(anchos[f"Mes {mes}"], len(val))
+
+    # Encabezado
+    print(" | ".join(h.ljust(anchos[h]) for h in encabezado))
+    print("-" * sum(anchos[h] + 3 for h in encabezado))
+
+    # Filas
+    for idAccesorio, conteos in recuento.items():
+        fila = [str(idAccesorio).ljust(anchos["idAccesorio"])]
+        for mes in meses:
+            val = str(conteos.get(mes, 0))
+            fila.append(val.ljust(anchos[f"Mes {mes}"]))
+        print(" | ".join(fila))
+
+
+def informeRecuentoAccesorios(rentas, anios, agregados=None):
+    """
+    Muestra el recuento de accesorios rentados por mes de los años indicados.
+    """
+    print(f"\nAccesorios rentados por mes ({describirAnios(anios)}):")
+    mostrarRecuentoAccesorios(recuentoAccesoriosPorMes(rentas, anios, agregados))
+
+def informeDineroPorMes(rentas, anios, agregados=None):
+    """
+    Muestra la matriz de depósitos por mes de cada uno de los años indicados y el total
+    de depósitos del año (de los depósitos por mes de los agregados).
+    """
+    if agregados is None:
+        agregados = obtenerAgregadosRentas(rentas)
+    matrices = generarMatrizDineroPorMes(rentas, anios=anios, agregados=agregados)
+    for anio in anios:
+        print(f"\nDepósitos por mes de {anio}:")
+        mostrarMatrizDinero(*matrices[anio])
+        total = sum(deposito for (anioDeposito, _), deposito in agregados["depositosPorMes"].items()
+                    if anioDeposito == anio)
+        print(f"Total de depósitos de {anio}: ${total:.2f}")
+
+def ingresosPorCliente(rentas, agregados=None):
+    """
+    Importe total rentado por cada cliente, de mayor a menor, tomado de los agregados
+    de informes (no se recorren las rentas).
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+        agregados (dict, opcional): Agregados ya calculados (ver calcularAgregadosParalelo).
+    
+    Returns:
+        list: Pares (idCliente, total), sin los clientes cuyo total es 0.
+    """
+    if agregados is None:
+        agregados = obtenerAgregadosRentas(rentas)
+    ingresos = [(idCliente, total) for idCliente, total in agregados["ingresosPorCliente"].items() if total]
+    return sorted(ingresos, key=lambda par: (-par[1], par[0]))
+
+def informeIngresosPorCliente(rentas, agregados=None):
+    """
+    Muestra el importe total rentado por cada cliente, de mayor a menor.
+    """
+    ingresos = ingresosPorCliente(rentas, agregados)
+    if not ingresos:
+        print("No hay rentas registradas.")
+        return
+    clientes = obtenerDatos("clientes.json")
+    lineas = ["\nIngresos por cliente:",
+              f"{'Cliente':<12} | {celdaTabla('Nombre', MAX_ANCHO_COLUMNA)} | {'Total':>12}"]
+    lineas.append("-" * len(lineas[1]))
+    for idCliente, total in ingresos:
+        cliente = clientes.get(idCliente)
+        nombre = f"{cliente.get('nombre', '')} {cliente.get('apellido', '')}".strip() if isinstance(cliente, dict) else ""
+        lineas.append(f"{celdaTabla(idCliente, 12)} | {celdaTabla(nombre, MAX_ANCHO_COLUMNA)} | {total:>12.2f}")
+    sys.stdout.write("\n".join(lineas) + "\n")
+    sys.stdout.flush()
+
+def generarMatrizDineroPorMes(rentas, anio_filtrado=None, anios=None, agregados=None):
+    """
+    Genera una matriz de depósitos por mes agrupada por accesorio.
+    Se arma a partir de los agregados de rentas, sumando cada uno en su celda (ver matrizPorMes).
+    
+    Args:
+        rentas (dict): Diccionario con todas las rentas (o iterador de pares, ver iterarRentas)
+        anio_filtrado (int, opcional): Año a filtrar. Si es None, incluye todos.
+        anios (list, opcional): Lista de años. Si se indica, se genera una matriz por año.
+        agregados (dict, opcional): Agregados ya calculados (ver calcularAgregadosParalelo).
+                                    Si se indican, no se recorren las rentas.
+    
+    Returns:
+        tuple: (matriz, idAccesorios, meses)
+        Si se indica `anios`: dict {anio: (matriz, idAccesorios, meses)}
+    """
+    meses = list(range(1, 13))
+    aniosPedidos = set(anios) if anios is not None else None
+    if agregados is None:
+        agregados = obtenerAgregadosRentas(rentas)
+    accesorios = agregados["accesorios"]
+    idAccesorios = sorted({idAccesorio for idAccesorio, _, _ in accesorios})
+    posiciones = {idAccesorio: fila for fila, idAccesorio in enumerate(idAccesorios)}
+
+    celdasPorGrupo = {} # anio (o None si no se separa por año) -> (filas, meses, depósitos)
+
+    for (idAccesorio, anio, mes), acumulado in accesorios.items():
+        if aniosPedidos is not None:
+            if anio not in aniosPedidos:
+                continue
+            grupo = anio
+        elif anio_filtrado and anio != anio_filtrado:
+            continue
+        else:
+            grupo = None
+
+        celdas = celdasPorGrupo.get(grupo)
+        if celdas is None:
+            celdas = celdasPorGrupo[grupo] = celdasVacias()
+        filas, mesesCelda, depositos = celdas
+        filas.append(posiciones[idAccesorio])
+        mesesCelda.append(mes)
+        depositos.append(acumulado[AGREGADO_DEPOSITO])
+
+    if aniosPedidos is None:
+        return armarMatrizDinero(celdasPorGrupo.get(None) or celdasVacias(), idAccesorios, meses)
+    return {
+        anio: armarMatrizDinero(celdasPorGrupo.get(anio) or celdasVacias(), idAccesorios, meses)
+        for anio in anios
+    }
+
+def celdasVacias():
+    """
+    Devuelve las columnas (filas, meses, depósitos) para ir cargando celdas de la matriz de depósitos.
+    """
+    return array("q"), array("B"), array("d")
+
+def armarMatrizDinero(celdas, idAccesorios, meses):
+    """
+    Arma la matriz de depósitos (una fila por accesorio más la fila SUBTOTAL, ver matrizPorMes).
+    
+    Args:
+        celdas (tuple): Columnas (filas, meses, depósitos) de los agregados a sumar (ver celdasVacias)
+        idAccesorios (list): Accesorios a incluir, en orden (la fila es la posición en esta lista)
+        meses (list): Meses de las columnas
+    
+    Returns:
+        tuple: (matriz, idAccesorios, meses)
+    """
+    filas, mesesCelda, depositos = celdas
+    matriz = matrizPorMes(filas, mesesCelda, depositos, len(idAccesorios))
+    return matriz, idAccesorios + ["SUBTOTAL"], meses
+
+
+def mostrarMatrizDinero(matriz, idAccesorios, meses):
+    """
+    Muestra la matriz de depósitos por mes en formato horizontal.
+    """
+    if not matriz or not idAccesorios:
+        print("No hay datos de depósitos para mostrar.")
+        return
+
+    encabezado = ["idAccesorio"] + [f"Mes {m}" for m in meses]
+    anchos = {h: len(h) for h in encabezado}
+
+    # Calcular anchos por columna
+    for idx, idAcc in enumerate(idAccesorios):
+        anchos["idAccesorio"] = max(anchos["idAccesorio"], len(str(idAcc)))
+        for j, mes in enumerate(meses):
+            val = f"{matriz[idx][j]:.2f}"
+            anchos[f"Mes {mes}"] = max(anchos[f"Mes {mes}"], len(val))
+
+    # Imprimir encabezado
+    print(" | ".join(h.ljust(anchos[h]) for h in encabezado))
+    print("-" * sum(anchos[h] + 3 for h in encabezado))
+
+    # Imprimir filas
+    for i, idAccesorio in enumerate(idAccesorios):
+        fila = [str(idAccesorio).ljust(anchos["idAccesorio"])]
+        for j, mes in enumerate(meses):
+            valor = f"{matriz[i][j]:.2f}"
+            fila.append(valor.ljust(anchos[f"Mes {mes}"]))
+        print(" | ".join(fila))
+
+def cargarRentasDesdeArchivo(nombre_archivo):
+    """
+    Carga las rentas guardadas (los archivos por año, ver rutaParticionRentas) y las devuelve
+    como un diccionario. Después de leerlas aplica las entradas del diario de rentas.
+    Si no hay rentas guardadas, devuelve un diccionario vacío.
+    Si un archivo está dañado, el programa termina avisando (ver leerJSON) en lugar de seguir sin rentas.
+    """
+    return cargarRentasConPosicion(nombre_archivo)[0]
+
+def cargarRentasConPosicion(nombre_archivo, anios=None):
+    """
+    Carga las rentas (archivos por año más diario) y devuelve además hasta dónde se leyó,
+    para poder sincronizar después solo lo nuevo (ver sincronizarRentas).
+    Si otro proceso compacta las rentas durante la lectura, se vuelve a leer.
+    Args:
+        anios (set, opcional): Años que se cargan completos. De los demás solo se cargan
+                               las rentas abiertas (ver rentasAbiertasDeAnio). Si es None, todos.
+    Returns:
+        tuple: (rentas, versión de los archivos por año, bytes leídos del diario, entradas del diario)
+    """
+    migrarRentasAParticiones(nombre_archivo)
+    while True:
+        version = versionRentas(nombre_archivo)
+        rentas = {}
+        for anio, versionAnio in version:
+            if anios is None or anio in anios:
+                particion = leerJSON(rutaParticionRentas(nombre_archivo, anio))
+            else:
+                particion = rentasAbiertasDeAnio(nombre_archivo, anio, versionAnio)
+            for idRenta, renta in particion.items():
+                rentas[idRenta] = aRenta(renta)
+        posicion = 0
+        entradas = 0
+        for idRenta, renta, posicion in leerDiarioDesde(rutaDiarioRentas(nombre_archivo), 0):
+            if renta is None:
+                rentas.pop(idRenta, None)
+            else:
+                rentas[idRenta] = aRenta(renta)
+            entradas += 1
+        if versionRentas(nombre_archivo) == version:
+            return rentas, version, posicion, entradas
+
+def serializarJSON(datos):
+    """
+    Serializa a JSON en formato compacto. Es el único formato de escritura de los archivos del programa.
+    """
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":"), default=serializarObjeto)
+
+def serializarObjeto(objeto):
+    """
+    Convierte para JSON los objetos del programa que no son tipos básicos (ver Renta).
+    """
+    if isinstance(objeto, Renta):
+        return objeto.aDict()
+    raise TypeError(f"No se puede guardar en JSON: {type(objeto).__name__}")
+
+def leerJSON(archivo):
+    """
+    Lee un archivo JSON. Si no existe o está vacío devuelve un diccionario vacío.
+    Si está dañado, termina el programa con un aviso: seguir con datos vacíos
+    terminaría sobrescribiendo el archivo y perdiendo su contenido.
+    """
+    try:
+        f = open(archivo, mode='r', encoding='utf-8')
+        contenido = f.read()
+        f.close()
+    except FileNotFoundError:
+        return {}
+    if not contenido.strip():
+        return {}
+    try:
+        return json.loads(contenido)
+    except json.JSONDecodeError as e:
+        sys.exit(f"El archivo {archivo} está dañado ({e}). Restáurelo antes de volver a ejecutar el programa.")
+
+def abrirTemporal(archivo):
+    """
+    Abre un archivo temporal en la misma carpeta que `archivo` para escribir su nuevo contenido.
+    Returns:
+        tuple: (archivo abierto, ruta del temporal). Se completa con confirmarTemporal.
+    """
+    carpeta = os.path.dirname(os.path.abspath(archivo))
+    descriptor, temporal = tempfile.mkstemp(prefix=os.path.basename(archivo) + ".", suffix=".tmp", dir=carpeta)
+    try:
+        os.chmod(temporal, os.stat(archivo).st_mode & 0o777) # Conservar los permisos del original
+    except FileNotFoundError:
+        os.chmod(temporal, 0o644)
+    return os.fdopen(descriptor, mode='w', encoding='utf-8'), temporal
+
+def confirmarTemporal(f, temporal, archivo):
+    """
+    Fuerza a disco el temporal (fsync) y lo renombra sobre `archivo`. El renombrado es atómico:
+    quien lea el archivo ve el contenido anterior completo o el nuevo completo, nunca uno a medias.
+    """
+    try:
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        os.replace(temporal, archivo)
+    except BaseException:
+        f.close()
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+    sincronizarCarpeta(archivo)
+
+def sincronizarCarpeta(archivo):
+    """
+    Fuerza a disco la carpeta del archivo, para que un renombrado o archivo nuevo sobreviva a un corte.
+    En sistemas que no lo permiten (Windows) no hace nada.
+    """
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(archivo)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    os.close(descriptor)
+
+def escribirJSONAtomico(archivo, datos):
+    """
+    Guarda `datos` en `archivo` de forma segura: temporal, fsync y renombrado.
+    Un corte o Ctrl-C durante la escritura deja intacto el archivo anterior.
+    Raises:
+        OSError: Si no se pudo escribir el archivo.
+    """
+    f, temporal = abrirTemporal(archivo)
+    try:
+        f.write(serializarJSON(datos))
+    except BaseException:
+        f.close()
+        os.remove(temporal)
+        raise
+    confirmarTemporal(f, temporal, archivo)
+
+def rutaDiarioRentas(nombre_archivo):
+    """
+    Devuelve la ruta del diario de rentas asociado al archivo de rentas.
+    Ej: "rentas.json" -> "rentas.diario.jsonl"
+    """
+    base, _ = os.path.splitext(nombre_archivo)
+    return base + ".diario.jsonl"
+
+def rutaParticionesRentas(nombre_archivo):
+    """
+    Devuelve la carpeta donde se guardan las rentas, un archivo por año (ver rutaParticionRentas).
+    Ej: "rentas.json" -> "rentas"
+    """
+    base, _ = os.path.splitext(nombre_archivo)
+    return base
+
+def rutaParticionRentas(nombre_archivo, anio):
+    """
+    Devuelve la ruta del archivo con las rentas de un año (según la fecha del idRenta).
+    Ej: ("rentas.json", 2025) -> "rentas/2025.json"
+    """
+    return os.path.join(rutaParticionesRentas(nombre_archivo), f"{anio:04d}.json")
+
+def rutaAbiertasRentas(nombre_archivo, anio):
+    """
+    Devuelve la ruta del archivo con las rentas abiertas de un año (ver rentasAbiertasDeAnio).
+    Ej: ("rentas.json", 2025) -> "rentas/2025.abiertas.json"
+    """
+    return os.path.join(rutaParticionesRentas(nombre_archivo), f"{anio:04d}.abiertas.json")
+
+def rentaAbierta(renta):
+    """
+    Indica si una renta sigue abierta (su estado no es uno de ESTADOS_CERRADOS).
+    """
+    return isinstance(renta, (dict, Renta)) and str(renta.get("estado", "")).strip().lower() not in ESTADOS_CERRADOS
+
+def guardarRentasAbiertas(nombre_archivo, anio, rentas):
+    """
+    Guarda las rentas abiertas de un año junto con la versión del archivo del año del que salen.
+    Raises:
+        OSError: Si no se pudo escribir el archivo.
+    """
+    abiertas = {idRenta: renta for idRenta, renta in rentas.items() if rentaAbierta(renta)}
+    escribirJSONAtomico(rutaAbiertasRentas(nombre_archivo, anio),
+                        {"version": versionArchivo(rutaParticionRentas(nombre_archivo, anio)), "rentas": abiertas})
+
+def rentasAbiertasDeAnio(nombre_archivo, anio, version):
+    """
+    Devuelve las rentas abiertas de un año sin cargar el año completo. Se leen del archivo
+    de abiertas del año si corresponde a la versión actual de su archivo; si no (falta o quedó
+    desactualizado), se recorre el archivo del año por bloques y se vuelve a guardar.
+    Args:
+        version (tuple): Versión del archivo del año (ver versionArchivo).
+    Returns:
+        dict: {idRenta: renta} de las rentas abiertas del año.
+    """
+    try:
+        f = open(rutaAbiertasRentas(nombre_archivo, anio), mode='r', encoding='utf-8')
+        contenido = json.load(f)
+        f.close()
+        if contenido["version"] == list(version):
+            return contenido["rentas"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    ruta = rutaParticionRentas(nombre_archivo, anio)
+    try:
+        f = open(ruta, mode='r', encoding='utf-8')
+    except FileNotFoundError:
+        return {} # Lo borró una compactación: quien llama vuelve a leer
+    try:
+        rentas = dict(iterarParesJSON(f))
+    except ValueError as e:
+        sys.exit(f"El archivo {ruta} está dañado ({e}). Restáurelo antes de volver a ejecutar el programa.")
+    finally:
+        f.close()
+    if versionArchivo(ruta) == version:
+        try:
+            guardarRentasAbiertas(nombre_archivo, anio, rentas)
+        except OSError as e:
+            print("No se pudo guardar el archivo:", e)
+    return {idRenta: renta for idRenta, renta in rentas.items() if rentaAbierta(renta)}
+
+def aniosParticiones(nombre_archivo):
+    """
+    Devuelve, ordenados, los años que tienen archivo de rentas.
+    """
+    try:
+        nombres = os.listdir(rutaParticionesRentas(nombre_archivo))
+    except FileNotFoundError:
+        return []
+    return sorted(int(nombre[:4]) for nombre in nombres if re.fullmatch(r"\d{4}\.json", nombre))
+
+def anioRenta(idRenta):
+    """
+    Devuelve el año de una renta según su idRenta, que indica en qué archivo por año se guarda.
+    Si el idRenta no empieza con un año devuelve 0 (se guarda en "0000.json").
+    """
+    try:
+        return int(idRenta.split(".", 1)[0])
+    except (ValueError, AttributeError):
+        return 0
+
+def versionRentas(nombre_archivo):
+    """
+    Identifica la versión de las rentas guardadas: el año y la versión (ver versionArchivo)
+    de cada archivo por año. Compactar reescribe o borra algún archivo, así que la cambia.
+    Returns:
+        tuple: ((anio, versión), ...)
+    """
+    return tuple((anio, versionArchivo(rutaParticionRentas(nombre_archivo, anio)))
+                 for anio in aniosParticiones(nombre_archivo))
+
+def particionarRentas(rentas, anios=None):
+    """
+    Separa las rentas por año, conservando su orden.
+    Args:
+        rentas (dict): Diccionario de rentas
+        anios (set, opcional): Años a incluir (aunque no tengan rentas). Si es None, todos.
+    Returns:
+        dict: {anio: {idRenta: renta}}
+    """
+    particiones = {anio: {} for anio in anios} if anios is not None else {}
+    for idRenta, renta in rentas.items():
+        anio = anioRenta(idRenta)
+        if anios is None:
+            particiones.setdefault(anio, {})[idRenta] = renta
+        elif anio in particiones:
+            particiones[anio][idRenta] = renta
+    return particiones
+
+def escribirParticionesRentas(nombre_archivo, particiones):
+    """
+    Guarda (de forma atómica, ver escribirJSONAtomico) el archivo de cada año de `particiones`
+    y el de sus rentas abiertas (ver rentasAbiertasDeAnio).
+    El archivo de un año que quedó sin rentas se borra.
+    Raises:
+        OSError: Si no se pudo escribir algún archivo.
+    """
+    os.makedirs(rutaParticionesRentas(nombre_archivo), exist_ok=True)
+    for anio, rentas in particiones.items():
+        ruta = rutaParticionRentas(nombre_archivo, anio)
+        if rentas:
+            escribirJSONAtomico(ruta, rentas)
+            guardarRentasAbiertas(nombre_archivo, anio, rentas)
+            continue
+        for ruta in (ruta, rutaAbiertasRentas(nombre_archivo, anio)):
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+def migrarRentasAParticiones(nombre_archivo):
+    """
+    Pasa las rentas guardadas en un solo archivo (el formato anterior, "rentas.json")
+    a los archivos por año. El archivo anterior se conserva como "rentas.json.migrado".
+    El diario no cambia: sus entradas se aplican igual sobre los archivos por año.
+    """
+    if SQLITE["conexion"] is not None or not os.path.isfile(nombre_archivo):
+        return
+    with bloqueoArchivo(nombre_archivo):
+        if not os.path.isfile(nombre_archivo):
+            return # Ya lo migró otro proceso
+        particiones = particionarRentas(leerJSON(nombre_archivo))
+        for anio, rentas in particiones.items():
+            # Si el año ya tenía archivo, se conservan sus rentas (las del archivo anterior las reemplazan)
+            existentes = leerJSON(rutaParticionRentas(nombre_archivo, anio))
+            existentes.update(rentas)
+            particiones[anio] = existentes
+        try:
+            escribirParticionesRentas(nombre_archivo, particiones)
+            os.replace(nombre_archivo, nombre_archivo + ".migrado")
+        except OSError as e:
+            print(f"Error al migrar rentas: {e}")
+            return
+        print(f"Las rentas de {nombre_archivo} se guardan ahora por año en la carpeta {rutaParticionesRentas(nombre_archivo)}.")
+
+def agregarRentaAlDiario(nombre_archivo, idRenta, renta):
+    """
+    Agrega al final del diario una línea JSON con una renta nueva o modificada,
+    sin reescribir el archivo de rentas completo.
+    Args:
+        nombre_archivo (str): Archivo de rentas al que pertenece el diario.
+        idRenta (str): Clave de la renta.
+        renta (dict): Datos de la renta. None indica que la renta fue eliminada.
+    Returns:
+        bool: True si la línea se guardó correctamente.
+    """
+    linea = serializarJSON({"idRenta": idRenta, "renta": renta})
+    try:
+        ruta = rutaDiarioRentas(nombre_archivo)
+        nuevo = not os.path.exists(ruta)
+        f = open(ruta, mode='a', encoding='utf-8')
+        if f.tell() > 0 and not terminaEnLinea(ruta):
+            linea = "\n" + linea # Se cierra una línea que quedó cortada
+        f.write(linea + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        if nuevo:
+            sincronizarCarpeta(ruta)
+        return True
+    except OSError as e:
+        print(f"Error al guardar rentas: {e}")
+        return False
+
+def leerDiarioDesde(ruta, posicion):
+    """
+    Recorre el diario de rentas a partir de la posición (en bytes) indicada y devuelve
+    (idRenta, renta, posición al final de la línea) por cada entrada.
+    Solo se leen líneas completas: una línea que otro proceso está escribiendo
+    se leerá en la próxima sincronización. Una línea dañada se ignora.
+    Si el diario no existe no devuelve nada.
+    """
+    try:
+        f = open(ruta, mode='rb')
+    except FileNotFoundError:
+        return
+
+    f.seek(posicion)
+    for linea in f:
+        if not linea.endswith(b"\n"):
+            break
+        posicion += len(linea)
+        if not linea.strip():
+            continue
+        try:
+            entrada = json.loads(linea)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            print("Se ignoró una línea dañada del diario de rentas.")
+            continue
+        yield entrada["idRenta"], entrada["renta"], posicion
+    f.close()
+
+def leerEntradasJSONL(ruta):
+    """
+    Recorre un archivo JSON-lines con el formato del diario de rentas
+    ({"idRenta": ..., "renta": ...} por línea) y devuelve los pares (idRenta, renta) de a uno.
+    Una línea incompleta (por ejemplo, por un corte durante la escritura) se ignora.
+    Si el archivo no existe no devuelve nada.
+    """
+    try:
+        f = open(ruta, mode='r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+
+    for linea in f:
+        try:
+            entrada = json.loads(linea)
+        except json.JSONDecodeError:
+            print("Se ignoró una línea dañada del diario de rentas.")
+            continue
+        yield entrada["idRenta"], entrada["renta"]
+    f.close()
+
+def iterarParesJSON(f, tamanioBloque=TAMANIO_BLOQUE_LECTURA):
+    """
+    Recorre un objeto JSON de primer nivel leyendo el archivo por bloques y devuelve
+    sus pares (clave, valor) de a uno, sin cargar el objeto completo en memoria.
+    Args:
+        f: Archivo abierto en modo texto.
+        tamanioBloque (int): Caracteres a leer por bloque.
+    """
+    decodificador = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    esperando = "{" # "{", "clave", ":", "valor" o "," (separador o cierre)
+    clave = None
+    finArchivo = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+
+        if pos >= len(buffer):
+            if finArchivo:
+                if esperando == "{":
+                    return # Archivo vacío
+                raise ValueError("El archivo JSON está incompleto.")
+            bloque = f.read(tamanioBloque)
+            finArchivo = not bloque
+            buffer = buffer[pos:] + bloque
+            pos = 0
+            continue
+
+        caracter = buffer[pos]
+        if esperando == "{":
+            if caracter != "{":
+                raise ValueError("Se esperaba un objeto JSON.")
+            pos += 1
+            esperando = "clave"
+        elif esperando == ":":
+            if caracter != ":":
+                raise ValueError("Se esperaba ':' en el objeto JSON.")
+            pos += 1
+            esperando = "valor"
+        elif esperando == ",":
+            pos += 1
+            if caracter == "}":
+                return
+            if caracter != ",":
+                raise ValueError("Se esperaba ',' o '}' en el objeto JSON.")
+            esperando = "clave"
+        else:
+            if esperando == "clave" and caracter == "}":
+                return # Objeto vacío
+            try:
+                valor, fin = decodificador.raw_decode(buffer, pos)
+                # Un número cortado por el bloque ("15000." o "-1.5e") se lee como uno más corto:
+                # está completo solo si después viene algo que no puede continuarlo
+                esNumero = isinstance(valor, (int, float)) and not isinstance(valor, bool)
+                restante = buffer[fin:].lstrip("0123456789.eE+-") if esNumero else buffer[fin:]
+                completo = restante != "" or finArchivo
+            except json.JSONDecodeError:
+                if finArchivo:
+                    raise
+                completo = False
+            if not completo:
+                bloque = f.read(tamanioBloque)
+                finArchivo = not bloque
+                buffer = buffer[pos:] + bloque
+                pos = 0
+                continue
+
+            pos = fin
+            if esperando == "clave":
+                clave = valor
+                esperando = ":"
+            else:
+                yield clave, valor
+                esperando = ","
+
+        # Descartar lo ya procesado para que el buffer no crezca
+        if pos > tamanioBloque:
+            buffer = buffer[pos:]
+            pos = 0
+
+def iterarRentas(nombre_archivo, anios=None):
+    """
+    Recorre las rentas guardadas y devuelve los pares (idRenta, renta) de a uno, sin
+    armar el diccionario completo. Sirve para los informes sobre historiales grandes.
+    - Si el archivo termina en .jsonl se lee una renta por línea (ver exportarRentasJSONL).
+    - Si no, se leen por bloques los archivos por año y se aplican las entradas del diario
+      (el diario se mantiene chico porque se compacta periódicamente).
+    - Si hay una base SQLite conectada, se recorre la tabla de rentas.
+    Args:
+        nombre_archivo (str): Archivo de rentas
+        anios (list, opcional): Años a recorrer. Si se indica, solo se leen los archivos de esos años.
+    """
+    if SQLITE["conexion"] is not None:
+        consulta = "SELECT idRenta, datos FROM rentas"
+        parametros = ()
+        if anios is not None:
+            consulta += f" WHERE anio IN ({','.join('?' for _ in anios)})"
+            parametros = tuple(anios)
+        for clave, datos in SQLITE["conexion"].execute(consulta, parametros):
+            yield clave, aRenta(json.loads(datos))
+        return
+
+    if nombre_archivo.endswith(".jsonl"):
+        for idRenta, renta in leerEntradasJSONL(nombre_archivo):
+            if renta is not None and (anios is None or anioRenta(idRenta) in anios):
+                yield idRenta, aRenta(renta)
+        return
+
+    migrarRentasAParticiones(nombre_archivo)
+    cambios = {} # idRenta -> última versión en el diario (None = eliminada)
+    for idRenta, renta in leerEntradasJSONL(rutaDiarioRentas(nombre_archivo)):
+        if anios is None or anioRenta(idRenta) in anios:
+            cambios[idRenta] = renta
+
+    for anio in aniosParticiones(nombre_archivo):
+        if anios is not None and anio not in anios:
+            continue
+        try:
+            f = open(rutaParticionRentas(nombre_archivo, anio), mode='r', encoding='utf-8')
+        except FileNotFoundError:
+            continue # Lo borró una compactación
+        for idRenta, renta in iterarParesJSON(f):
+            if idRenta in cambios:
+                renta = cambios.pop(idRenta)
+                if renta is None:
+                    continue
+            yield idRenta, aRenta(renta)
+        f.close()
+
+    for idRenta, renta in cambios.items():
+        if renta is not None:
+            yield idRenta, aRenta(renta)
+
+def exportarRentasJSONL(nombre_archivo, destino):
+    """
+    Exporta las rentas a un archivo JSON-lines (una renta por línea), que después
+    puede recorrerse con iterarRentas sin cargarlo completo.
+    """
+    try:
+        f, temporal = abrirTemporal(destino)
+        cantidad = 0
+        try:
+            for idRenta, renta in iterarRentas(nombre_archivo):
+                f.write(serializarJSON({"idRenta": idRenta, "renta": renta}) + "\n")
+                cantidad += 1
+        except BaseException:
+            f.close()
+            os.remove(temporal)
+            raise
+        confirmarTemporal(f, temporal, destino)
+        print(f"{cantidad} renta(s) exportadas a {destino}.")
+    except OSError as e:
+        print("No se pudo guardar el archivo:", e)
+
+def terminaEnLinea(ruta):
+    """
+    Indica si el último byte del archivo es un salto de línea.
+    """
+    f = open(ruta, mode='rb')
+    f.seek(-1, os.SEEK_END)
+    ultimo = f.read(1)
+    f.close()
+    return ultimo == b"\n"
+
+def compactarRentas(nombre_archivo, anios, rentasNuevas=None):
+    """
+    Vuelca en los archivos por año las entradas del diario y las rentas de `rentasNuevas`
+    de los años indicados, y vacía el diario. Cada año se arma leyendo su archivo, así que
+    no hace falta tenerlo cargado (ver cargarAniosRentas). Los demás años no se reescriben.
+    Si la escritura falla, el diario se conserva. Debe llamarse con las rentas bloqueadas.
+    Returns:
+        bool: True si se compactó.
+    """
+    cambios = dict(leerEntradasJSONL(rutaDiarioRentas(nombre_archivo)))
+    cambios.update(rentasNuevas or {})
+    particiones = particionarRentas(cambios, set(anios))
+    for anio, cambiosAnio in particiones.items():
+        rentas = leerJSON(rutaParticionRentas(nombre_archivo, anio))
+        for idRenta, renta in cambiosAnio.items():
+            if renta is None:
+                rentas.pop(idRenta, None)
+            else:
+                rentas[idRenta] = renta
+        particiones[anio] = rentas
+    try:
+        escribirParticionesRentas(nombre_archivo, particiones)
+    except OSError as e:
+        print(f"Error al compactar rentas: {e}")
+        return False
+
+    try:
+        os.remove(rutaDiarioRentas(nombre_archivo))
+    except FileNotFoundError:
+        pass
+    return True
+
+def leerRegistrosImportacion(ruta):
+    """
+    Recorre un archivo CSV (con encabezado) o JSON-lines y devuelve (número de fila, registro)
+    de a uno. En JSON-lines se acepta también el formato de exportarRentasJSONL.
+    Una línea JSON dañada se devuelve como registro None, para informarla como error.
+    """
+    f = open(ruta, mode='r', encoding='utf-8', newline='')
+    try:
+        if ruta.lower().endswith(".csv"):
+            for numero, fila in enumerate(csv.DictReader(f), start=2): # La fila 1 es el encabezado
+                yield numero, {campo.strip(): (valor or "").strip() for campo, valor in fila.items() if campo}
+            return
+
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                yield numero, None
+                continue
+            if isinstance(registro, dict) and isinstance(registro.get("renta"), dict):
+                registro = dict(registro["renta"], idRenta=registro.get("idRenta"))
+            yield numero, registro
+    finally:
+        f.close()
 
-def mostrarMatrizDinero(matriz, idAccesorios, meses):
+def campoImportado(registro, campo, parseFn, defecto=None):
     """
-    Muestra la matriz de depósitos por mes en formato horizontal.
+    Lee un campo de un registro importado y lo convierte con `parseFn`.
+    Si falta (o está vacío) devuelve `defecto`; si además no hay defecto es un error.
+    Raises:
+        ValueError: Si el campo falta o no se puede convertir.
     """
-    if not matriz or not idAccesorios:
-        print("No hay datos de depósitos para mostrar.")
-        return
+    valor = registro.get(campo)
+    if valor is None or valor == "":
+        if defecto is None:
+            raise ValueError(f"falta el campo '{campo}'")
+        return defecto
+    try:
+        return parseFn(str(valor) if parseFn is parseString else valor)
+    except (ValueError, TypeError):
+        raise ValueError(f"valor inválido en '{campo}': {valor}")
 
-    encabezado = ["idAccesorio"] + [f"Mes {m}" for m in meses]
-    anchos = {h: len(h) for h in encabezado}
+def fechaImportada(valor):
+    """
+    Valida una fecha importada con el formato AAAA.MM.DD.hh.mm.ss y la devuelve como texto.
+    """
+    valor = str(valor).strip()
+    datetime.strptime(valor, "%Y.%m.%d.%H.%M.%S")
+    return valor
 
-    # Calcular anchos por columna
-    for idx, idAcc in enumerate(idAccesorios):
-        anchos["idAccesorio"] = max(anchos["idAccesorio"], len(str(idAcc)))
-        for j, mes in enumerate(meses):
-            val = f"{matriz[idx][j]:.2f}"
-            anchos[f"Mes {mes}"] = max(anchos[f"Mes {mes}"], len(val))
+def boolImportado(valor):
+    """
+    Convierte a booleano un valor importado ("true"/"false" o un booleano JSON).
+    """
+    if isinstance(valor, bool):
+        return valor
+    if not esBoolLiteral(str(valor)):
+        raise ValueError(valor)
+    return parseBool(str(valor))
 
-    # Imprimir encabezado
-    print(" | ".join(h.ljust(anchos[h]) for h in encabezado))
-    print("-" * sum(anchos[h] + 3 for h in encabezado))
+def numeroNoNegativo(parseFn):
+    """
+    Devuelve un conversor que aplica `parseFn` y rechaza los valores negativos.
+    """
+    def convertir(valor):
+        numero = parseFn(valor)
+        if numero < 0:
+            raise ValueError(valor)
+        return numero
+    return convertir
+
+def validarClienteImportado(registro):
+    """
+    Valida un cliente importado con las mismas reglas que obtenerDatosCliente.
+    Returns:
+        tuple: (documento, cliente)
+    Raises:
+        ValueError: Con la descripción del primer error encontrado.
+    """
+    documento = campoImportado(registro, "idCliente", parseString)
+    email = campoImportado(registro, "email", parseString)
+    if not validarEmail(email):
+        raise ValueError(f"email inválido: {email}")
+    fechaNacimiento = campoImportado(registro, "fechaNacimiento", parseString)
+    if not validarFecha(fechaNacimiento):
+        raise ValueError(f"fecha de nacimiento inválida: {fechaNacimiento}")
+    telefonos = registro.get("telefonos") or ""
+    if not isinstance(telefonos, dict):
+        telefonos = parseTelefonos(str(telefonos))
+
+    return documento, {
+        "idCliente": documento,
+        "tipoDocumento": campoImportado(registro, "tipoDocumento", parseString),
+        "nombre": campoImportado(registro, "nombre", parseString),
+        "apellido": campoImportado(registro, "apellido", parseString),
+        "email": email,
+        "fechaNacimiento": fechaNacimiento,
+        "telefonos": telefonos,
+        "activo": campoImportado(registro, "activo", boolImportado, True)
+    }
 
-    # Imprimir filas
-    for i, idAccesorio in enumerate(idAccesorios):
-        fila = [str(idAccesorio).ljust(anchos["idAccesorio"])]
-        for j, mes in enumerate(meses):
-            valor = f"{matriz[i][j]:.2f}"
-            fila.append(valor.ljust(anchos[f"Mes {mes}"]))
-        print(" | ".join(fila))
+def validarAccesorioImportado(registro):
+    """
+    Valida un accesorio importado con las mismas reglas que la carga por menú.
+    Returns:
+        tuple: (codigo, accesorio)
+    Raises:
+        ValueError: Con la descripción del primer error encontrado.
+    """
+    codigo = campoImportado(registro, "idAccesorio", parseString)
+    colores = normalizarColores(registro.get("colores"))
+
+    return codigo, {
+        'activo': campoImportado(registro, "activo", boolImportado, True),
+        'nombre': campoImportado(registro, "nombre", parseString),
+        'descripcion': campoImportado(registro, "descripcion", parseString),
+        'stock': campoImportado(registro, "stock", numeroNoNegativo(int)),
+        'precioUnitario': campoImportado(registro, "precioUnitario", numeroNoNegativo(float)),
+        'colores': colores
+    }
 
-def cargarRentasDesdeArchivo(nombre_archivo):
+def validarRentaImportada(registro, clientes, accesorios):
     """
-    Carga el contenido del archivo JSON de rentas y lo devuelve como un diccionario.
-    Si el archivo no existe o está vacío/mal formado, devuelve un diccionario vacío.
+    Valida una renta importada. El cliente debe existir y estar activo, como al registrar
+    una renta desde el menú, y el accesorio debe existir. La fecha de devolución, si viene,
+    debe tener el formato AAAA.MM.DD.hh.mm.ss. Si faltan, el total y la fecha de devolución se calculan como en registrarNuevaRenta.
+    Returns:
+        tuple: (idRenta, renta)
+    Raises:
+        ValueError: Con la descripción del primer error encontrado.
     """
+    idRenta = campoImportado(registro, "idRenta", parseString)
     try:
-        f = open(nombre_archivo, mode='r', encoding='utf-8')
-        rentas = json.load(f)
-        f.close()
-        return rentas
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        fecha = datetime.strptime(".".join(idRenta.split(".")[:6]), "%Y.%m.%d.%H.%M.%S")
+    except ValueError:
+        raise ValueError(f"idRenta inválido (se espera AAAA.MM.DD.hh.mm.ss): {idRenta}")
+    idCliente = campoImportado(registro, "idCliente", parseString)
+    if idCliente not in clientes:
+        raise ValueError(f"el cliente {idCliente} no existe")
+    if not clientes[idCliente].get("activo", True):
+        raise ValueError(f"el cliente {idCliente} está inactivo")
+    idAccesorio = campoImportado(registro, "idAccesorio", parseString)
+    if idAccesorio not in accesorios:
+        raise ValueError(f"el accesorio {idAccesorio} no existe")
 
+    dias = campoImportado(registro, "dias", numeroNoNegativo(int))
+    cantidad = campoImportado(registro, "cantidad", numeroNoNegativo(int))
+    if cantidad == 0:
+        raise ValueError("la cantidad debe ser mayor a 0")
+    precioUnitario = float(accesorios[idAccesorio].get("precioUnitario", 0))
+    fechaDevolucion = (fecha + timedelta(days=dias)).strftime("%Y.%m.%d.%H.%M.%S")
+
+    return idRenta, {
+        "idRenta": idRenta,
+        "idCliente": idCliente,
+        "dias": dias,
+        "fecha Devolucion": campoImportado(registro, "fecha Devolucion", fechaImportada, fechaDevolucion),
+        "total": campoImportado(registro, "total", numeroNoNegativo(float), cantidad * precioUnitario * dias),
+        "deposito": campoImportado(registro, "deposito", numeroNoNegativo(float), 0.0),
+        "estado": campoImportado(registro, "estado", parseString),
+        "metodoPago": campoImportado(registro, "metodoPago", parseString),
+        "idAccesorio": idAccesorio,
+        "cantidad": str(cantidad)
+    }
 
-def guardarRentasEnArchivo(nombre_archivo, rentas):
+def importarRegistros(tipo, ruta):
     """
-    Guarda el diccionario de rentas en el archivo JSON indicado.
-    Sobrescribe completamente el contenido anterior del archivo.
+    Importa clientes, accesorios o rentas desde un archivo CSV o JSON-lines.
+    Cada fila se valida por separado y los errores se informan con su número de fila;
+    las filas válidas se guardan todas juntas, con una sola escritura del archivo de datos.
+    Los registros cuya clave ya existe no se importan. Las rentas importadas se consideran
+    históricas: no descuentan stock.
+    Args:
+        tipo (str): "clientes", "accesorios" o "rentas".
+        ruta (str): Archivo a importar (.csv o .jsonl).
+    Returns:
+        bool: True si se guardaron las filas válidas (aunque haya habido errores).
     """
+    archivo = ARCHIVOS_IMPORTACION[tipo]
+    nuevos = {}
+    errores = 0
+    with bloqueoArchivo(archivo):
+        datos = obtenerDatos(archivo)
+        if tipo == "rentas":
+            clientes = obtenerDatos("clientes.json")
+            accesorios = obtenerDatos("accesorios.json")
+        try:
+            for numero, registro in leerRegistrosImportacion(ruta):
+                try:
+                    if not isinstance(registro, dict):
+                        raise ValueError("no es un registro válido")
+                    if tipo == "clientes":
+                        clave, valor = validarClienteImportado(registro)
+                    elif tipo == "accesorios":
+                        clave, valor = validarAccesorioImportado(registro)
+                    else:
+                        clave, valor = validarRentaImportada(registro, clientes, accesorios)
+                        cargarAniosRentas([anioRenta(clave)]) # Para ver si ya existe
+                    if clave in datos or clave in nuevos:
+                        raise ValueError(f"{clave} ya existe")
+                    nuevos[clave] = valor
+                except ValueError as e:
+                    errores += 1
+                    print(f"Fila {numero}: {e}")
+        except OSError as e:
+            print("No se pudo abrir el archivo:", e)
+            return False
 
-    try:
-        f = open(nombre_archivo, mode='w', encoding='utf-8')
-        json.dump(rentas, f, ensure_ascii=False, indent=4)
-        f.close()
-    except Exception as e:
-        print(f"Error al guardar rentas: {e}")
+        print(f"{len(nuevos)} registro(s) válido(s), {errores} fila(s) con errores.")
+        if not nuevos:
+            return True
+        if tipo == "rentas":
+            ok = guardarRentasImportadas(nuevos)
+        else:
+            datos.update(nuevos)
+            for clave in nuevos:
+                marcarModificado(archivo, clave)
+            ok = guardarRepositorio(archivo)
+    if ok:
+        print(f"{len(nuevos)} registro(s) importados en {archivo}.")
+    return ok
+
+def guardarRentasImportadas(rentas):
+    """
+    Agrega un lote de rentas al repositorio y lo guarda con una sola escritura:
+    una transacción en SQLite o una compactación de los archivos por año (en lugar de una línea
+    del diario por renta). Debe llamarse con el archivo de rentas bloqueado.
+    Returns:
+        bool: True si se guardaron.
+    """
+    repo = obtenerRepositorio(ARCHIVO_RENTAS)
+    if SQLITE["conexion"] is not None:
+        if not guardarRegistrosSQLite("rentas", rentas, list(rentas)):
+            return False
+    else:
+        sincronizarRentas(repo)
+    for idRenta, renta in rentas.items():
+        aplicarRentaEnRepositorio(repo, idRenta, renta)
+    if SQLITE["conexion"] is None:
+        return compactarRepositorioRentas(repo, rentas)
+    return True
 
 def altaRenta(accesorios):
     """
-        Registra una nueva renta:
-        - Verifica si el ID ya existe
-        - Calcula fecha de devolución y total
-        - Valida stock y actualiza inventario
-        - Guarda la renta en rentas.json
+        Pide por consola los datos de una nueva renta y la registra (ver registrarNuevaRenta).
+        Los datos se validan a medida que se ingresan; conectado a un servidor
+        (accesorios=None) la existencia del cliente y del accesorio la verifica el servidor.
     """
-    clientes = leerArchivo("clientes.json")  
-    rentas = cargarRentasDesdeArchivo("rentas.json")
+    clientes = obtenerDatos("clientes.json") if accesorios is not None else None
     print("--- Alta de Renta ---")
-    
-    idRenta = datetime.now().strftime("%Y.%m.%d.%H.%M.%S")
-    while idRenta in rentas:
-        idRenta = datetime.now().strftime("%Y.%m.%d.%H.%M.%S")
 
     idCliente = input("Ingrese ID de Cliente: ")
-    if idCliente not in clientes or not clientes[idCliente].get("activo", True):
+    if clientes is not None and (idCliente not in clientes or not clientes[idCliente].get("activo", True)):
         print("ERROR: Cliente no encontrado o inactivo.")
         return
 
 
     try:
         dias = int(input("Ingrese cantidad de días: "))
+        if dias <= 0:
+            raise ValueError
     except ValueError:
         print("Cantidad de días inválida.")
         return
 
     idAccesorio = input("Ingrese ID de Accesorio: ")
-    if idAccesorio not in accesorios:
+    if accesorios is not None and idAccesorio not in accesorios:
         print("ERROR: Accesorio no encontrado.")
         return
 
     try:
         cantidad = int(input("Ingrese cantidad: "))
+        if cantidad <= 0:
+            raise ValueError
     except ValueError:
         print("Cantidad inválida.")
         return
 
-    try:
-        stockDisponible = int(accesorios[idAccesorio].get("stock", 0))
-    except (ValueError, KeyError):
-        print("Error al leer stock disponible.")
-        return
-
-    if cantidad > stockDisponible:
-        print(f"No hay suficiente stock. Disponible: {stockDisponible}")
-        return
-
-    fechaDevolucion = (datetime.now() + timedelta(days=dias)).strftime("%Y.%m.%d.%H.%M.%S")
-
-    try:
-        precioUnitario = float(accesorios[idAccesorio].get("precioUnitario", 0))
-    except (ValueError, KeyError):
-        print("Error al leer precio unitario.")
-        return
+    if accesorios is not None:
+        try:
+            stockDisponible = disponibilidadAccesorio(idAccesorio, date.today(), date.today() + timedelta(days=dias))
+        except (ValueError, KeyError):
+            print("Error al leer stock disponible.")
+            return
 
-    total = cantidad * precioUnitario * dias
+        if stockDisponible is None or cantidad > stockDisponible:
+            print(f"No hay suficiente stock. Disponible: {stockDisponible or 0}")
+            return
 
     try:
         deposito = float(input("Ingrese depósito: "))
@@ -960,25 +3617,512 @@ def altaRenta(accesorios):
     estado = input("Ingrese estado: ")
     metodoPago = input("Ingrese método de pago: ")
 
-    accesorios[idAccesorio]["stock"] = stockDisponible - cantidad
+    ejecutarOperacion("altaRenta", idCliente=idCliente, dias=dias, idAccesorio=idAccesorio,
+                      cantidad=cantidad, deposito=deposito, estado=estado, metodoPago=metodoPago)
 
-    rentas[idRenta] = {
-        "idRenta": idRenta,
-        "idCliente": idCliente,
-        "dias": dias,
-        "fecha Devolucion": fechaDevolucion,
-        "total": total,
-        "deposito": deposito,
-        "estado": estado,
-        "metodoPago": metodoPago,
-        "idAccesorio": idAccesorio,
-        "cantidad": str(cantidad)
-    }
+def registrarNuevaRenta(idCliente, dias, idAccesorio, cantidad, deposito, estado, metodoPago):
+    """
+        Registra una nueva renta:
+        - Genera un idRenta único (ver generarIdRenta)
+        - Calcula fecha de devolución y total
+        - Valida que la cantidad y los días sean positivos y que haya unidades libres
+          durante toda la renta (ver disponibilidadAccesorio)
+        - Guarda la renta en el diario de rentas.json
+        Se hace con las rentas bloqueadas, después de incorporar las rentas de otros mostradores.
+        El stock no se modifica: las unidades quedan reservadas mientras la renta esté abierta.
+    """
+    if cantidad <= 0 or dias <= 0:
+        print("ERROR: La cantidad y los días deben ser mayores a 0.")
+        return
+    with bloqueoArchivo(ARCHIVO_RENTAS):
+        clientes = obtenerDatos("clientes.json")
+        accesorios = obtenerDatos("accesorios.json")
+
+        if idCliente not in clientes or not clientes[idCliente].get("activo", True):
+            print("ERROR: Cliente no encontrado o inactivo.")
+            return
+        if idAccesorio not in accesorios:
+            print("ERROR: Accesorio no encontrado.")
+            return
+
+        try:
+            stockDisponible = disponibilidadAccesorio(idAccesorio, date.today(), date.today() + timedelta(days=dias))
+        except (ValueError, KeyError):
+            print("Error al leer stock disponible.")
+            return
+        if stockDisponible is None or cantidad > stockDisponible:
+            print(f"No hay suficiente stock. Disponible: {stockDisponible or 0}")
+            return
+
+        try:
+            precioUnitario = float(accesorios[idAccesorio].get("precioUnitario", 0))
+        except (ValueError, KeyError):
+            print("Error al leer precio unitario.")
+            return
+
+        idRenta = generarIdRenta()
+
+        fechaDevolucion = (datetime.now() + timedelta(days=dias)).strftime("%Y.%m.%d.%H.%M.%S")
+        total = cantidad * precioUnitario * dias
+
+        renta = {
+            "idRenta": idRenta,
+            "idCliente": idCliente,
+            "dias": dias,
+            "fecha Devolucion": fechaDevolucion,
+            "total": total,
+            "deposito": deposito,
+            "estado": estado,
+            "metodoPago": metodoPago,
+            "idAccesorio": idAccesorio,
+            "cantidad": str(cantidad)
+        }
 
-    guardarRentasEnArchivo("rentas.json", rentas)
+        if not registrarRenta(ARCHIVO_RENTAS, idRenta, renta):
+            return
     print("Renta registrada exitosamente.")
     print(f"Fecha de devolución calculada: {fechaDevolucion}")
     print(f"Total calculado automáticamente: ${total:.2f}")
+
+#----------------------------------------------------------------------------------------------
+# SERVIDOR
+#----------------------------------------------------------------------------------------------
+def operacionInformeTotal(limite=None, desplazamiento=0):
+    """
+    Informe Total para el servidor: la tabla completa, sin pausas entre páginas.
+    """
+    mostrarTablaRenta(cargarAniosRentas(), limite, desplazamiento, paginar=False)
+
+def operacionInformeMesActual():
+    """
+    Informe del mes actual para el servidor (ver informeMesActual).
+    """
+    informeMesActual(cargarAniosRentas([datetime.now().year]), paginar=False)
+
+def operacionInformeMes(mes, anio=None):
+    """
+    Informe de un mes para el servidor (ver informeMesEspecifico). Sin año, el del año actual.
+    """
+    anio = anio or datetime.now().year
+    informeMesEspecifico(cargarAniosRentas([anio]), mes, anio, paginar=False)
+
+def operacionEstadoCuenta(idCliente):
+    """
+    Estado de cuenta de un cliente para el servidor (ver informeEstadoCuenta).
+    """
+    informeEstadoCuenta(cargarAniosRentas(), idCliente, paginar=False)
+
+def operacionDisponibilidad(idAccesorio, desde, hasta):
+    """
+    Disponibilidad de un accesorio entre dos fechas para el servidor (ver informeDisponibilidad).
+    """
+    informeDisponibilidad(idAccesorio, desde, hasta)
+
+def operacionDisponibilidadCatalogo(desde, hasta):
+    """
+    Disponibilidad de todo el catálogo entre dos fechas para el servidor (ver informeDisponibilidadCatalogo).
+    """
+    informeDisponibilidadCatalogo(desde, hasta)
+
+def operacionRentasVencidas():
+    """
+    Informe de rentas vencidas para el servidor (ver informeRentasVencidas).
+    """
+    informeRentasVencidas(paginar=False)
+
+def operacionRecuentoAccesorios(anios=None):
+    """
+    Recuento de accesorios por mes para el servidor (ver informeRecuentoAccesorios).
+    Sin años, el del año actual.
+    """
+    informeRecuentoAccesorios(obtenerDatos(ARCHIVO_RENTAS), anios or [datetime.now().year])
+
+def operacionDineroPorMes(anios=None):
+    """
+    Matriz de dinero por mes para el servidor (ver informeDineroPorMes). Sin años, el del año actual.
+    """
+    informeDineroPorMes(obtenerDatos(ARCHIVO_RENTAS), anios or [datetime.now().year])
+
+def operacionIngresosPorCliente():
+    """
+    Ingresos por cliente para el servidor (ver informeIngresosPorCliente).
+    """
+    informeIngresosPorCliente(obtenerDatos(ARCHIVO_RENTAS))
+
+def textoPedido(valor):
+    """
+    Valida un texto recibido en un pedido: debe ser una cadena no vacía. Devuelve la cadena sin espacios.
+    """
+    if not isinstance(valor, str) or not valor.strip():
+        raise ValueError(valor)
+    return parseString(valor)
+
+def enteroPedido(minimo=None, maximo=None):
+    """
+    Devuelve un conversor que acepta solo enteros JSON (no booleanos) dentro de [minimo, maximo].
+    """
+    def convertir(valor):
+        if isinstance(valor, bool) or not isinstance(valor, int):
+            raise ValueError(valor)
+        if (minimo is not None and valor < minimo) or (maximo is not None and valor > maximo):
+            raise ValueError(valor)
+        return valor
+    return convertir
+
+def decimalPedido(valor):
+    """
+    Valida un número no negativo recibido en un pedido (entero o decimal JSON) y lo devuelve como float.
+    """
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(valor)
+    return numeroNoNegativo(float)(valor)
+
+def fechaPedido(valor):
+    """
+    Valida una fecha YYYY-MM-DD recibida en un pedido y la devuelve como texto.
+    """
+    datetime.strptime(textoPedido(valor), "%Y-%m-%d")
+    return parseString(valor)
+
+def aniosPedido(valor):
+    """
+    Valida una lista de años recibida en un pedido. Devuelve los años sin repetir, ordenados.
+    """
+    if not isinstance(valor, list) or not valor:
+        raise ValueError(valor)
+    return sorted({enteroPedido(1, 9999)(anio) for anio in valor})
+
+def registroPedido(valor):
+    """
+    Valida que un parámetro sea un objeto JSON (diccionario).
+    """
+    if not isinstance(valor, dict):
+        raise ValueError(valor)
+    return valor
+
+def coloresPedido(valor):
+    """
+    Valida los colores de un accesorio recibidos en un pedido: diccionario, lista de textos
+    o texto separado por comas (ver normalizarColores).
+    """
+    if isinstance(valor, list):
+        valor = [textoPedido(color) for color in valor]
+    elif isinstance(valor, dict):
+        valor = {clave: textoPedido(color) for clave, color in valor.items()}
+    elif not isinstance(valor, str):
+        raise ValueError(valor)
+    return normalizarColores(valor)
+
+def esquemaPedido(**campos):
+    """
+    Devuelve un validador de los parámetros de un pedido.
+    Args:
+        campos: nombre del parámetro -> (conversor, requerido). El conversor lanza ValueError
+                o TypeError si el valor no es válido.
+    Returns:
+        function: Recibe los parámetros del pedido y devuelve los parámetros convertidos.
+                  Lanza ValueError si hay parámetros desconocidos, falta uno requerido
+                  o alguno no es válido. Los parámetros opcionales ausentes (o null) se omiten.
+    """
+    def validar(parametros):
+        desconocidos = sorted(set(parametros) - set(campos))
+        if desconocidos:
+            raise ValueError(f"parámetro desconocido: {', '.join(desconocidos)}")
+        validados = {}
+        for nombre, (conversor, requerido) in campos.items():
+            valor = parametros.get(nombre)
+            if valor is None:
+                if requerido:
+                    raise ValueError(f"falta el parámetro '{nombre}'")
+                continue
+            try:
+                validados[nombre] = conversor(valor)
+            except (ValueError, TypeError):
+                raise ValueError(f"valor inválido en '{nombre}': {valor!r}")
+        return validados
+    return validar
+
+def validarPedidoAltaCliente(parametros):
+    """
+    Valida un alta de cliente recibida por el servidor con las reglas de la importación
+    (ver validarClienteImportado). El idCliente guardado es siempre el documento del pedido.
+    """
+    parametros = esquemaPedido(documento=(textoPedido, True), cliente=(registroPedido, True))(parametros)
+    documento, cliente = validarClienteImportado(dict(parametros["cliente"], idCliente=parametros["documento"]))
+    return {"documento": documento, "cliente": cliente}
+
+def validarPedidoAltaAccesorio(parametros):
+    """
+    Valida un alta de accesorio recibida por el servidor con las reglas de la importación
+    (ver validarAccesorioImportado).
+    """
+    parametros = esquemaPedido(codigo=(textoPedido, True), nombre=(textoPedido, True),
+                               descripcion=(textoPedido, True), stock=(enteroPedido(0), True),
+                               precioUnitario=(decimalPedido, True), colores=(coloresPedido, False),
+                               activo=(boolImportado, False))(parametros)
+    parametros["idAccesorio"] = parametros.pop("codigo")
+    codigo, accesorio = validarAccesorioImportado(parametros)
+    return {"codigo": codigo, "nombre": accesorio["nombre"], "descripcion": accesorio["descripcion"],
+            "stock": accesorio["stock"], "precioUnitario": accesorio["precioUnitario"],
+            "colores": accesorio["colores"], "activo": accesorio["activo"]}
+
+# Validación de los parámetros de cada operación pedida al servidor (ver procesarPedido):
+# nombre -> función que recibe los parámetros del pedido y devuelve los parámetros convertidos.
+VALIDACIONES_PEDIDO = {
+    "altaCliente": validarPedidoAltaCliente,
+    "eliminarCliente": esquemaPedido(documento=(textoPedido, True)),
+    "listarClientes": esquemaPedido(),
+    "buscarClientes": esquemaPedido(criterio=(textoPedido, True), valor=(textoPedido, True)),
+    "altaAccesorio": validarPedidoAltaAccesorio,
+    "eliminarAccesorio": esquemaPedido(codigo=(textoPedido, True)),
+    "listarAccesorios": esquemaPedido(color=(textoPedido, False), precioMin=(decimalPedido, False),
+                                      precioMax=(decimalPedido, False), stockMin=(enteroPedido(0), False)),
+    "altaRenta": esquemaPedido(idCliente=(textoPedido, True), dias=(enteroPedido(1), True),
+                               idAccesorio=(textoPedido, True), cantidad=(enteroPedido(1), True),
+                               deposito=(decimalPedido, True), estado=(textoPedido, True),
+                               metodoPago=(textoPedido, True)),
+    "disponibilidad": esquemaPedido(idAccesorio=(textoPedido, True), desde=(fechaPedido, True),
+                                    hasta=(fechaPedido, True)),
+    "disponibilidadCatalogo": esquemaPedido(desde=(fechaPedido, True), hasta=(fechaPedido, True)),
+    "devolverRenta": esquemaPedido(idRenta=(textoPedido, True), retencion=(decimalPedido, False)),
+    "cancelarRenta": esquemaPedido(idRenta=(textoPedido, True)),
+    "rentasVencidas": esquemaPedido(),
+    "informeTotal": esquemaPedido(limite=(enteroPedido(0), False), desplazamiento=(enteroPedido(0), False)),
+    "informeMesActual": esquemaPedido(),
+    "informeMes": esquemaPedido(mes=(enteroPedido(1, 12), True), anio=(enteroPedido(1, 9999), False)),
+    "recuentoAccesorios": esquemaPedido(anios=(aniosPedido, False)),
+    "dineroPorMes": esquemaPedido(anios=(aniosPedido, False)),
+    "ingresosPorCliente": esquemaPedido(),
+    "estadoCuenta": esquemaPedido(idCliente=(textoPedido, True))
+}
+
+# Operaciones que se pueden pedir al servidor: nombre -> (función, si modifica datos, archivo).
+# El archivo (o None) lo fija el programa y se pasa como parámetro `archivo`: no lo elige quien pide.
+# Las funciones no piden datos por consola; lo que imprimen se devuelve como "salida".
+OPERACIONES = {
+    "altaCliente": (registrarCliente, True, "clientes.json"),
+    "eliminarCliente": (eliminarCliente, True, "clientes.json"),
+    "listarClientes": (listarClientes, False, "clientes.json"),
+    "buscarClientes": (mostrarBusquedaClientes, False, "clientes.json"),
+    "altaAccesorio": (registrarAccesorio, True, "accesorios.json"),
+    "eliminarAccesorio": (eliminarAccesorios, True, "accesorios.json"),
+    "listarAccesorios": (listarAccesorios, False, "accesorios.json"),
+    "altaRenta": (registrarNuevaRenta, True, None),
+    "disponibilidad": (operacionDisponibilidad, False, None),
+    "disponibilidadCatalogo": (operacionDisponibilidadCatalogo, False, None),
+    "devolverRenta": (devolverRenta, True, None),
+    "cancelarRenta": (cancelarRenta, True, None),
+    "rentasVencidas": (operacionRentasVencidas, False, None),
+    "informeTotal": (operacionInformeTotal, False, None),
+    "informeMesActual": (operacionInformeMesActual, False, None),
+    "informeMes": (operacionInformeMes, False, None),
+    "recuentoAccesorios": (operacionRecuentoAccesorios, False, None),
+    "dineroPorMes": (operacionDineroPorMes, False, None),
+    "ingresosPorCliente": (operacionIngresosPorCliente, False, None),
+    "estadoCuenta": (operacionEstadoCuenta, False, None)
+}
+
+def llamarOperacion(operacion, parametros):
+    """
+    Ejecuta una operación de OPERACIONES con sus parámetros, agregando el archivo que le corresponde.
+    """
+    funcion, _, archivo = OPERACIONES[operacion]
+    if archivo is not None:
+        parametros = dict(parametros, archivo=archivo)
+    funcion(**parametros)
+
+def procesarPedido(pedido):
+    """
+    Ejecuta un pedido recibido por el servidor y arma la respuesta.
+    Args:
+        pedido (dict): {"operacion": nombre, "parametros": {...}}
+    Returns:
+        dict: {"ok": bool, "salida": texto impreso por la operación, "error": mensaje (si falló)}
+    """
+    if not isinstance(pedido, dict) or pedido.get("operacion") not in OPERACIONES:
+        return {"ok": False, "salida": "", "error": "Operación desconocida."}
+    modifica = OPERACIONES[pedido["operacion"]][1]
+    parametros = pedido.get("parametros") or {}
+    # El archivo de cada operación lo fija OPERACIONES; no se acepta que lo indique el pedido
+    if not isinstance(parametros, dict) or "archivo" in parametros:
+        return {"ok": False, "salida": "", "error": "Parámetros inválidos."}
+    # Los datos llegan de otro programa: se validan antes de llegar a los repositorios
+    try:
+        parametros = VALIDACIONES_PEDIDO[pedido["operacion"]](parametros)
+    except ValueError as e:
+        return {"ok": False, "salida": "", "error": f"Parámetros inválidos: {e}"}
+
+    salida = io.StringIO()
+    respuesta = {"ok": True}
+    with contextlib.redirect_stdout(salida):
+        try:
+            llamarOperacion(pedido["operacion"], parametros)
+            if modifica and not guardarRepositorios():
+                respuesta = {"ok": False, "error": "No se pudieron guardar los cambios."}
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            respuesta = {"ok": False, "error": f"Parámetros inválidos: {e}"}
+        except SystemExit as e:
+            # leerJSON termina el programa si un archivo está dañado: el servidor sigue atendiendo
+            respuesta = {"ok": False, "error": str(e)}
+    respuesta["salida"] = salida.getvalue()
+    return respuesta
+
+async def atenderConexion(lector, escritor):
+    """
+    Atiende una conexión: lee pedidos JSON (uno por línea) y responde cada uno en una línea.
+    Las operaciones se ejecutan de a una en el bucle de eventos, por lo que todas
+    las conexiones ven el mismo estado en memoria.
+    """
+    try:
+        while True:
+            linea = await lector.readline()
+            if not linea:
+                break
+            try:
+                respuesta = procesarPedido(json.loads(linea))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                respuesta = {"ok": False, "salida": "", "error": "Pedido inválido."}
+            escritor.write((serializarJSON(respuesta) + "\n").encode("utf-8"))
+            await escritor.drain()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        pass
+    finally:
+        escritor.close()
+
+def separarDireccion(direccion):
+    """
+    Separa una dirección "host:puerto". Si la dirección contiene "/", es la ruta de un socket Unix.
+    Returns:
+        tuple: (host, puerto), o (ruta, None) para un socket Unix.
+    """
+    if "/" in direccion:
+        return direccion, None
+    host, _, puerto = direccion.rpartition(":")
+    return host or "127.0.0.1", int(puerto)
+
+async def servir(direccion):
+    """
+    Escucha conexiones en la dirección indicada hasta que se interrumpa el programa.
+    """
+    host, puerto = separarDireccion(direccion)
+    if puerto is None:
+        servidor = await asyncio.start_unix_server(atenderConexion, path=host)
+    else:
+        servidor = await asyncio.start_server(atenderConexion, host, puerto)
+    # Ctrl+C o SIGTERM cierran el servidor; los cambios se guardan al salir (ver iniciarServidor)
+    bucle = asyncio.get_running_loop()
+    for senial in (signal.SIGINT, signal.SIGTERM):
+        try:
+            bucle.add_signal_handler(senial, servidor.close)
+        except NotImplementedError: # Windows
+            pass
+    print(f"Servidor escuchando en {direccion}. Ctrl+C para terminar.", flush=True)
+    async with servidor:
+        try:
+            await servidor.serve_forever()
+        except asyncio.CancelledError:
+            pass
+    print("Servidor detenido.")
+
+def iniciarServidor(direccion):
+    """
+    Carga los datos en memoria y atiende pedidos de los menús conectados (ver conectarServidor).
+    Args:
+        direccion (str): "host:puerto" (TCP) o ruta de un socket Unix.
+    """
+    for archivo in TABLAS_SQLITE:
+        obtenerRepositorio(archivo)
+    try:
+        asyncio.run(servir(direccion))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
+    finally:
+        guardarRepositorios()
+
+def conectarServidor(direccion):
+    """
+    Conecta el menú a un servidor. Desde entonces las operaciones se envían al servidor
+    (ver ejecutarOperacion) en lugar de ejecutarse sobre los archivos locales.
+    Returns:
+        bool: True si se pudo conectar.
+    """
+    try:
+        host, puerto = separarDireccion(direccion)
+        if puerto is None:
+            conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conexion.connect(host)
+        else:
+            conexion = socket.create_connection((host, puerto))
+    except (OSError, ValueError) as e:
+        print(f"No se pudo conectar al servidor {direccion}: {e}")
+        return False
+    SERVIDOR["archivo"] = conexion.makefile(mode='rw', encoding='utf-8', newline='\n')
+    return True
+
+def ejecutarOperacion(operacion, **parametros):
+    """
+    Ejecuta una operación (ver OPERACIONES): sobre los datos locales o, si el menú está
+    conectado a un servidor, enviándola y mostrando lo que devuelve.
+    """
+    f = SERVIDOR["archivo"]
+    if f is None:
+        llamarOperacion(operacion, parametros)
+        return
+
+    try:
+        f.write(serializarJSON({"operacion": operacion, "parametros": parametros}) + "\n")
+        f.flush()
+        linea = f.readline()
+    except OSError as e:
+        print(f"Error de comunicación con el servidor: {e}")
+        return
+    if not linea:
+        print("El servidor cerró la conexión.")
+        return
+    respuesta = json.loads(linea)
+    print(respuesta.get("salida", ""), end="")
+    if not respuesta.get("ok"):
+        print(f"ERROR: {respuesta.get('error')}")
+
+def leerArgumentos():
+    """
+    Lee las opciones de línea de comandos del programa.
+    Returns:
+        argparse.Namespace: Opciones leídas.
+    """
+    parser = argparse.ArgumentParser(description="Gestión de Accesorios de Ski")
+    parser.add_argument("--sqlite", metavar="RUTA",
+                        help="usar la base SQLite indicada en lugar de los archivos JSON")
+    parser.add_argument("--importar-sqlite", metavar="RUTA",
+                        help="importar los archivos JSON a la base SQLite indicada y salir")
+    parser.add_argument("--exportar-jsonl", metavar="RUTA",
+                        help="exportar las rentas a un archivo JSON-lines y salir")
+    parser.add_argument("--informes-streaming", action="store_true",
+                        help="calcular los informes leyendo las rentas de a una, sin cargarlas en memoria")
+    parser.add_argument("--limit", type=int, default=None, metavar="N",
+                        help="cantidad máxima de rentas a mostrar en el Informe Total")
+    parser.add_argument("--offset", type=int, default=0, metavar="N",
+                        help="cantidad de rentas a saltear al principio del Informe Total")
+    parser.add_argument("--importar", nargs=2, action="append", metavar=("TIPO", "RUTA"),
+                        help="importar clientes, accesorios o rentas desde un archivo CSV o JSON-lines y salir "
+                             "(se puede repetir)")
+    parser.add_argument("--servidor", nargs="?", const=DIRECCION_SERVIDOR, metavar="DIRECCION",
+                        help="atender a los menús conectados con los datos en memoria "
+                             f"(host:puerto o ruta de socket Unix; por defecto {DIRECCION_SERVIDOR})")
+    parser.add_argument("--conectar", nargs="?", const=DIRECCION_SERVIDOR, metavar="DIRECCION",
+                        help="usar el menú como cliente de un servidor iniciado con --servidor")
+    parser.add_argument("--procesos", type=int, metavar="N",
+                        help="calcular el recuento y el dinero por mes leyendo las rentas de cada año "
+                             "en un proceso distinto, hasta N a la vez (implica --informes-streaming)")
+    argumentos = parser.parse_args()
+    if argumentos.procesos is not None and argumentos.procesos < 1:
+        parser.error("--procesos debe ser al menos 1")
+    if argumentos.limit is not None and argumentos.limit < 0:
+        parser.error("--limit no puede ser negativo")
+    if argumentos.offset < 0:
+        parser.error("--offset no puede ser negativo")
+    return argumentos
+
 #----------------------------------------------------------------------------------------------
 # CUERPO PRINCIPAL
 #----------------------------------------------------------------------------------------------
@@ -1474,9 +4618,38 @@ def main():
     }
 }
     """
-    accesorios = leerArchivo("accesorios.json") or {}
+    argumentos = leerArgumentos()
+    if argumentos.importar_sqlite:
+        importarJSONaSQLite(argumentos.importar_sqlite)
+        return
+    if argumentos.sqlite:
+        conectarSQLite(argumentos.sqlite)
+    if argumentos.exportar_jsonl:
+        exportarRentasJSONL(ARCHIVO_RENTAS, argumentos.exportar_jsonl)
+        return
+    if argumentos.importar:
+        for tipo, ruta in argumentos.importar:
+            if tipo not in ARCHIVOS_IMPORTACION:
+                print(f"Tipo de importación inválido: {tipo} (clientes, accesorios o rentas).")
+                continue
+            importarRegistros(tipo, ruta)
+        return
+
+    if argumentos.servidor:
+        iniciarServidor(argumentos.servidor)
+        return
+
     archivoJSONAccesorios = "accesorios.json"
     archivoJSONClientes = "clientes.json"
+    if argumentos.conectar:
+        # Cliente liviano: los datos los tiene el servidor
+        if not conectarServidor(argumentos.conectar):
+            return
+        accesorios = None
+    else:
+        accesorios = obtenerDatos(archivoJSONAccesorios)
+    conectado = accesorios is None
+    atexit.register(guardarRepositorios) # Guarda los cambios pendientes al salir
 
 
 
@@ -1513,7 +4686,7 @@ def main():
         elif opcionMenuPrincipal == "1":   # Opción 1 del menú principal
             while True:
                 while True:
-                    opciones = 4
+                    opciones = 5
                     print()
                     print("---------------------------")
                     print("MENÚ PRINCIPAL > MENÚ DE CLIENTES")
@@ -1522,6 +4695,7 @@ def main():
                     print("[2] Modificar Clientes")
                     print("[3] Eliminar Clientes")
                     print("[4] Listar Clientes")
+                    print("[5] Buscar Clientes")
                     print("---------------------------")
                     print("[0] Volver al menú anterior")
                     print("---------------------------")
@@ -1535,21 +4709,34 @@ def main():
                 print()
 
                 if opcionSubmenu == "0": # Opción salir del submenú
+                    guardarRepositorios() # Guarda los cambios hechos en el submenú
                     break # No sale del programa, sino que vuelve al menú anterior
                 
                 elif opcionSubmenu == "1":   # Opción 1 del submenú
                     altaCliente(archivoJSONClientes) 
                     
                 elif opcionSubmenu == "2":   # Opción 2 del submenú
-                    documento = input("Ingrese el documento del cliente a modificar: ")
-                    modificarCliente(archivoJSONClientes, documento)
+                    if conectado:
+                        print("Opción no disponible conectado a un servidor.")
+                    else:
+                        documento = input("Ingrese el documento del cliente a modificar: ")
+                        modificarCliente(archivoJSONClientes, documento)
                 
                 elif opcionSubmenu == "3":   # Opción 3 del submenú
                     documento = input("Ingrese el documento del cliente a eliminar: ")
-                    eliminarCliente(archivoJSONClientes, documento)
+                    ejecutarOperacion("eliminarCliente", documento=documento)
                 
                 elif opcionSubmenu == "4":   # Opción 4 del submenú
-                    listarClientes(archivoJSONClientes)
+                    ejecutarOperacion("listarClientes")
+
+                elif opcionSubmenu == "5":   # Opción 5 del submenú
+                    criterios = {"1": "email", "2": "apellido", "3": "telefono"}
+                    criterio = input("Buscar por [1] Email, [2] Apellido (comienzo), [3] Teléfono: ").strip()
+                    if criterio in criterios:
+                        valor = input("Ingrese el valor a buscar: ")
+                        ejecutarOperacion("buscarClientes", criterio=criterios[criterio], valor=valor)
+                    else:
+                        print("Criterio inválido.")
 
                 input("\nPresione ENTER para volver al menú.") # Pausa entre opciones
                 print("\n\n")
@@ -1558,7 +4745,7 @@ def main():
         elif opcionMenuPrincipal == "2":   # Opción 2 del menú principal
             while True:
                 while True:
-                    opciones = 4
+                    opciones = 5
                     print()
                     print("---------------------------")
                     print("MENÚ PRINCIPAL > MENÚ DE ACCESORIOS")
@@ -1567,6 +4754,7 @@ def main():
                     print("[2] Modificar Accesorio")
                     print("[3] Eliminar Accesorio")
                     print("[4] Listar Accesorios Activos")
+                    print("[5] Filtrar Accesorios Activos")
                     print("---------------------------")
                     print("[0] Volver al menú anterior")
                     print("---------------------------")
@@ -1580,6 +4768,7 @@ def main():
                 print()
 
                 if opcionSubmenu == "0": # Opción salir del submenú
+                    guardarRepositorios() # Guarda los cambios hechos en el submenú
                     break # No sale del programa, sino que vuelve al menú anterior
                 
                 elif opcionSubmenu == "1":   # Opción 1 del submenú
@@ -1588,7 +4777,7 @@ def main():
                         codigo = input("Ingrese el código del accesorio (o '-1' para terminar): ")
                         if codigo == '-1':
                             break
-                        while codigo in accesorios:
+                        while not conectado and codigo in accesorios:
                             print("El accesorio ya existe. No se puede agregar.")
                             codigo = input("Ingrese un nuevo código para el accesorio: ")
                         
@@ -1623,27 +4812,46 @@ def main():
                             except ValueError:
                                 print("Precio Invalido. Ingrese un numero positivo")
                         
-                        colores = input("Ingrese los colores del accesorio (separados por comas): ").split(',')
-                        colores = {f'color{i+1}': color.strip() for i, color in enumerate(colores)}
+                        colores = normalizarColores(input("Ingrese los colores del accesorio (separados por comas): "))
                         
                         # Agregar el accesorio al diccionario
-                        altaAccesorio(archivoJSONAccesorios, accesorios, codigo,nombre, descripcion, stock, precioUnitario, colores, activo)
-                        print("Accesorio agregado exitosamente.")
+                        ejecutarOperacion("altaAccesorio", codigo=codigo, nombre=nombre, descripcion=descripcion,
+                                          stock=stock, precioUnitario=precioUnitario, colores=colores, activo=activo)
 
                     
                 elif opcionSubmenu == "2":   # Opción 2 del submenú
                     # Modificar accesorio
-                    codigoModificar = input("Ingrese el código del accesorio a modificar: ")
-                    modificarAccesorio(archivoJSONAccesorios, codigoModificar)
+                    if conectado:
+                        print("Opción no disponible conectado a un servidor.")
+                    else:
+                        codigoModificar = input("Ingrese el código del accesorio a modificar: ")
+                        modificarAccesorio(archivoJSONAccesorios, codigoModificar)
                 
                 elif opcionSubmenu == "3":   # Opción 3 del submenú
                     # Eliminar accesorio
                     codigoEliminar = input("Ingrese el código del accesorio a eliminar: ")
-                    eliminarAccesorios(archivoJSONAccesorios, codigoEliminar)
+                    ejecutarOperacion("eliminarAccesorio", codigo=codigoEliminar)
                 
                 elif opcionSubmenu == "4":   # Opción 4 del submenú
                     # Listar accesorios activos
-                    listarAccesorios(archivoJSONAccesorios)
+                    ejecutarOperacion("listarAccesorios")
+
+                elif opcionSubmenu == "5":   # Opción 5 del submenú
+                    # Filtrar accesorios activos; ENTER deja el filtro sin aplicar
+                    print("Presione ENTER para no filtrar por ese dato.")
+                    try:
+                        color = input("Color: ").strip() or None
+                        precioMin = input("Precio mínimo: ").strip()
+                        precioMin = float(precioMin) if precioMin else None
+                        precioMax = input("Precio máximo: ").strip()
+                        precioMax = float(precioMax) if precioMax else None
+                        stockMin = input("Stock mínimo: ").strip()
+                        stockMin = int(stockMin) if stockMin else None
+                    except ValueError:
+                        print("Valor inválido.")
+                    else:
+                        ejecutarOperacion("listarAccesorios", color=color,
+                                          precioMin=precioMin, precioMax=precioMax, stockMin=stockMin)
 
                 input("\nPresione ENTER para volver al menú.") # Pausa entre opciones
                 print("\n\n")
@@ -1651,12 +4859,17 @@ def main():
         elif opcionMenuPrincipal == "3":   # Opción 3 del menú principal
             while True:
                 while True:
-                    opciones = 4
+                    opciones = 6
                     print()
                     print("---------------------------")
                     print("MENÚ PRINCIPAL > MENÚ DE RENTAS")
                     print("---------------------------")
                     print("[1] Ingresar Renta")
+                    print("[2] Consultar disponibilidad de un accesorio")
+                    print("[3] Consultar disponibilidad de todos los accesorios")
+                    print("[4] Devolver Renta")
+                    print("[5] Cancelar Renta")
+                    print("[6] Rentas vencidas")
                     print("---------------------------")
                     print("[0] Volver al menú anterior")
                     print("---------------------------")
@@ -1669,19 +4882,43 @@ def main():
                         input("Opción inválida. Presione ENTER para volver a seleccionar.")
                 print()
                 if opcionSubmenu == "0":
+                    guardarRepositorios()
                     break
                 elif opcionSubmenu == "1":
                     altaRenta(accesorios)
+                elif opcionSubmenu == "2":
+                    idAccesorio = input("Ingrese ID de Accesorio: ").strip()
+                    desde = pedirFecha("Desde (YYYY-MM-DD): ")
+                    hasta = pedirFecha("Hasta, día de devolución (YYYY-MM-DD): ")
+                    ejecutarOperacion("disponibilidad", idAccesorio=idAccesorio, desde=str(desde), hasta=str(hasta))
+                elif opcionSubmenu == "3":
+                    desde = pedirFecha("Desde (YYYY-MM-DD): ")
+                    hasta = pedirFecha("Hasta, día de devolución (YYYY-MM-DD): ")
+                    ejecutarOperacion("disponibilidadCatalogo", desde=str(desde), hasta=str(hasta))
+                elif opcionSubmenu == "4":
+                    idRenta = input("Ingrese ID de Renta: ").strip()
+                    try:
+                        retencion = float(input("Monto a retener del depósito (ENTER = 0): ").strip() or 0)
+                    except ValueError:
+                        print("Monto inválido.")
+                    else:
+                        ejecutarOperacion("devolverRenta", idRenta=idRenta, retencion=retencion)
+                elif opcionSubmenu == "5":
+                    ejecutarOperacion("cancelarRenta", idRenta=input("Ingrese ID de Renta: ").strip())
+                elif opcionSubmenu == "6":
+                    ejecutarOperacion("rentasVencidas")
                 input("\nPresione ENTER para volver al menú.")
                 print("\n\n")
         
         elif opcionMenuPrincipal == "4":   # Opción 4 del menú principal
-            # Cargar los datos de renta desde el archivo JSON
-            renta = leerArchivo("rentas.json")
+            # Rentas residentes en memoria (archivos por año + diario). Con --informes-streaming no se
+            # cargan: cada informe recorre el archivo de a una renta. Con --procesos, además,
+            # el recuento y el dinero por mes reparten los años entre procesos.
+            renta = None if argumentos.informes_streaming or argumentos.procesos or conectado else obtenerDatos(ARCHIVO_RENTAS)
 
             while True:
                 while True:
-                    opciones = 5
+                    opciones = 7
                     print()
                     print("---------------------------")
                     print("MENÚ PRINCIPAL > Informe")
@@ -1691,6 +4928,8 @@ def main():
                     print("[3] Informe de un Mes")
                     print("[4] Recuento accesorios por mes")
                     print("[5] Mostrar dinero por mes")
+                    print("[6] Estado de cuenta de un cliente")
+                    print("[7] Ingresos por cliente")
                     print("---------------------------")
                     print("[0] Volver al menú anterior")
                     print("---------------------------")
@@ -1705,23 +4944,65 @@ def main():
 
                 if opcionSubmenu == "0":
                     break
-                elif opcionSubmenu == "1":
-                    mostrarTablaRenta(renta)
+
+                # Años que usa el informe (None = todos). Con --informes-streaming
+                # solo se leen los archivos de esos años; si no, solo se cargan esos años.
+                anios = None
+                if opcionSubmenu == "2":
+                    anios = [datetime.now().year]
+                elif opcionSubmenu == "3":
+                    mes = pedirMes()
+                    anios = [pedirAnio()]
+                elif opcionSubmenu in ("4", "5"):
+                    anios = pedirAnios()
+
+                if conectado: # Los informes los arma el servidor
+                    if opcionSubmenu == "1":
+                        ejecutarOperacion("informeTotal", limite=argumentos.limit, desplazamiento=argumentos.offset)
+                    elif opcionSubmenu == "2":
+                        ejecutarOperacion("informeMesActual")
+                    elif opcionSubmenu == "3":
+                        ejecutarOperacion("informeMes", mes=mes, anio=anios[0])
+                    elif opcionSubmenu == "4":
+                        ejecutarOperacion("recuentoAccesorios", anios=anios)
+                    elif opcionSubmenu == "5":
+                        ejecutarOperacion("dineroPorMes", anios=anios)
+                    elif opcionSubmenu == "6":
+                        ejecutarOperacion("estadoCuenta", idCliente=input("Ingrese ID de Cliente: ").strip())
+                    elif opcionSubmenu == "7":
+                        ejecutarOperacion("ingresosPorCliente")
+                    continue
+
+                if renta is None:
+                    fuente = iterarRentas(ARCHIVO_RENTAS, anios)
+                elif opcionSubmenu in ("1", "2", "3", "6"):
+                    fuente = cargarAniosRentas(anios) # Los demás informes usan los agregados
+                else:
+                    fuente = renta
+                agregados = None
+                if argumentos.procesos and opcionSubmenu in ("4", "5", "7"):
+                    agregados = calcularAgregadosParalelo(ARCHIVO_RENTAS, anios, argumentos.procesos)
+                if opcionSubmenu == "1":
+                    mostrarTablaRenta(fuente, argumentos.limit, argumentos.offset)
                 elif opcionSubmenu == "2":
-                    informeMesActual(renta)
+                    informeMesActual(fuente)
                 elif opcionSubmenu == "3":
-                    informeMesEspecifico(renta)
+                    informeMesEspecifico(fuente, mes, anios[0])
                 elif opcionSubmenu == "4":
-                    recuento = recuentoAccesoriosPorMes(renta)
-                    mostrarRecuentoAccesorios(recuento)
+                    informeRecuentoAccesorios(fuente, anios, agregados)
                 elif opcionSubmenu == "5":
-                    matriz, ids, meses = generarMatrizDineroPorMes(renta)
-                    mostrarMatrizDinero(matriz, ids, meses)
+                    informeDineroPorMes(fuente, anios, agregados)
+                elif opcionSubmenu == "6":
+                    informeEstadoCuenta(fuente, input("Ingrese ID de Cliente: ").strip())
+                elif opcionSubmenu == "7":
+                    informeIngresosPorCliente(fuente, agregados)
 
         if opcionSubmenu != "0": # Pausa entre opciones. No la realiza si se vuelve de un submenú
             input("\nPresione ENTER para volver al menú.")
             print("\n\n")
 
 
-# Punto de entrada al programa
-main()
\ No newline at end of file
+# Punto de entrada al programa (los procesos de calcularAgregadosParalelo importan este
+# archivo sin ejecutar el menú)
+if __name__ == "__main__":
+    main()
\ No newline at end of file
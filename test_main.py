@@ -0,0 +1,220 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+import main
+
+
+def rentaDePrueba(idRenta, inicio, dias, cantidad, estado="pendiente", idAccesorio="01"):
+    """
+    Arma una renta con el formato del archivo, que empieza en `inicio` y dura `dias` días.
+    """
+    return {
+        "idRenta": idRenta,
+        "idCliente": "1",
+        "dias": dias,
+        "fecha Devolucion": (inicio + timedelta(days=dias)).strftime("%Y.%m.%d.%H.%M.%S"),
+        "total": 0.0,
+        "deposito": 0.0,
+        "estado": estado,
+        "metodoPago": "efectivo",
+        "idAccesorio": idAccesorio,
+        "cantidad": str(cantidad)
+    }
+
+
+class TestRentasVencidas(unittest.TestCase):
+    """
+    Una renta vencida que sigue abierta retiene sus unidades hasta que se cierra.
+    """
+
+    def setUp(self):
+        self.anterior = os.getcwd()
+        self.carpeta = tempfile.mkdtemp()
+        os.chdir(self.carpeta)
+        main.REPOSITORIOS.clear()
+        with open("accesorios.json", "w", encoding="utf-8") as f:
+            json.dump({"01": {"activo": True, "nombre": "a", "descripcion": "b", "stock": 5,
+                              "precioUnitario": 1.0, "colores": {}}}, f)
+
+        inicio = datetime.combine(date.today() - timedelta(days=10), datetime.min.time()).replace(hour=9)
+        self.idRenta = inicio.strftime("%Y.%m.%d.%H.%M.%S")
+        renta = rentaDePrueba(self.idRenta, inicio, 7, 3)
+        os.makedirs("rentas")
+        with open(os.path.join("rentas", f"{inicio.year}.json"), "w", encoding="utf-8") as f:
+            json.dump({self.idRenta: renta}, f)
+
+    def tearDown(self):
+        main.REPOSITORIOS.clear()
+        os.chdir(self.anterior)
+        shutil.rmtree(self.carpeta)
+
+    def test_rentaVencidaAbiertaOcupaUnidadesHoy(self):
+        hoy = date.today()
+        self.assertEqual(main.disponibilidadAccesorio("01", hoy, hoy + timedelta(days=1)), 2)
+        self.assertEqual(main.disponibilidadCatalogo(hoy, hoy + timedelta(days=1))["01"], (5, 3, 2))
+
+    def test_rentaVencidaAbiertaOcupaUnidadesEnElFuturo(self):
+        desde = date.today() + timedelta(days=30)
+        self.assertEqual(main.disponibilidadAccesorio("01", desde, desde + timedelta(days=3)), 2)
+        self.assertEqual(main.disponibilidadCatalogo(desde, desde + timedelta(days=3))["01"], (5, 3, 2))
+
+    def test_rentaVencidaDevueltaLiberaUnidades(self):
+        hoy = date.today()
+        self.assertTrue(main.devolverRenta(self.idRenta))
+        self.assertEqual(main.disponibilidadAccesorio("01", hoy, hoy + timedelta(days=1)), 5)
+        self.assertEqual(main.disponibilidadCatalogo(hoy, hoy + timedelta(days=1))["01"], (5, 0, 5))
+
+    def test_periodoAnteriorALaDevolucionNoSeExtiende(self):
+        main.obtenerDatos(main.ARCHIVO_RENTAS)
+        reservas = main.obtenerRepositorio(main.ARCHIVO_RENTAS)["reservas"]
+        hoy = date.today().toordinal()
+        self.assertEqual(main.unidadesReservadas(reservas, "01", hoy - 20, hoy - 12, hoy), 0)
+        self.assertEqual(main.unidadesReservadas(reservas, "01", hoy - 20, hoy - 9, hoy), 3)
+        self.assertEqual(main.reservasCatalogo(reservas, hoy - 20, hoy - 12, hoy), {})
+
+
+class TestReservas(unittest.TestCase):
+    """
+    Registro de reservas de las rentas abiertas (ver construirReservas).
+    """
+
+    def test_cantidadNoPositivaNoReserva(self):
+        inicio = datetime.combine(date.today(), datetime.min.time())
+        claves = [inicio.strftime("%Y.%m.%d.%H.%M.%S") + f".{i}" for i in range(3)]
+        rentas = {clave: main.aRenta(rentaDePrueba(clave, inicio, 3, cantidad))
+                  for clave, cantidad in zip(claves, (2, -3, 0))}
+        reservas = main.construirReservas(rentas)
+        hoy = date.today().toordinal()
+        self.assertEqual(set(reservas["rentas"]), {claves[0]})
+        self.assertEqual(main.unidadesReservadas(reservas, "01", hoy, hoy + 3, hoy), 2)
+        self.assertEqual(main.reservasCatalogo(reservas, hoy, hoy + 3, hoy), {"01": 2})
+
+
+class TestIterarParesJSON(unittest.TestCase):
+    """
+    Lectura por bloques de un objeto JSON (ver iterarParesJSON): el resultado no depende
+    de dónde caen los cortes entre bloques.
+    """
+
+    TEXTOS = [
+        '{"x":15000.0,"y":1}',
+        '{"a": -1.5e3, "b": 2E+10 , "c":-0.25e-2}',
+        '{ "r1" : {"total": 15000.0, "cantidad": "3", "dias": 10},\n  "r2": [1, 2.5, -3e1],\n  "r3": true, "r4": null, "r5": "x, }"}',
+        '{}',
+        '{"n": 123456789012345678901234567890}'
+    ]
+
+    def test_resultadoIgualParaCualquierTamanioDeBloque(self):
+        for texto in self.TEXTOS:
+            esperado = list(json.loads(texto).items())
+            for tamanio in range(1, len(texto) + 2):
+                with self.subTest(texto=texto, tamanio=tamanio):
+                    self.assertEqual(list(main.iterarParesJSON(io.StringIO(texto), tamanio)), esperado)
+
+    def test_numeroInvalidoEsError(self):
+        for tamanio in range(1, 12):
+            with self.subTest(tamanio=tamanio):
+                with self.assertRaises(ValueError):
+                    list(main.iterarParesJSON(io.StringIO('{"x":15000.x}'), tamanio))
+
+
+class TestAgregadosRentas(unittest.TestCase):
+    """
+    Los agregados de informes se actualizan con cada renta y se guardan en disco.
+    """
+
+    def setUp(self):
+        self.anterior = os.getcwd()
+        self.carpeta = tempfile.mkdtemp()
+        os.chdir(self.carpeta)
+        main.REPOSITORIOS.clear()
+
+    def tearDown(self):
+        main.REPOSITORIOS.clear()
+        os.chdir(self.anterior)
+        shutil.rmtree(self.carpeta)
+
+    def test_altaYCierreActualizanIngresosYDepositos(self):
+        rentas = main.obtenerDatos(main.ARCHIVO_RENTAS)
+        self.assertEqual(main.ingresosPorCliente(rentas), [])
+        inicio = datetime(2025, 3, 4, 10, 0, 0)
+        renta = dict(rentaDePrueba("2025.03.04.10.00.00", inicio, 2, 1), total=300.0, deposito=50.0)
+        self.assertTrue(main.registrarRenta(main.ARCHIVO_RENTAS, renta["idRenta"], renta))
+        renta = dict(rentaDePrueba("2025.03.09.10.00.00", inicio, 2, 1), total=100.0, deposito=20.0,
+                     idRenta="2025.03.09.10.00.00", idCliente="2")
+        self.assertTrue(main.registrarRenta(main.ARCHIVO_RENTAS, renta["idRenta"], renta))
+
+        agregados = main.obtenerAgregadosRentas(rentas)
+        self.assertEqual(main.ingresosPorCliente(rentas), [("1", 300.0), ("2", 100.0)])
+        self.assertEqual(agregados["depositosPorMes"], {(2025, 3): 70.0})
+        self.assertEqual(agregados, main.calcularAgregadosRentas(rentas))
+
+        main.guardarRepositorios()
+        self.assertEqual(main.cargarAgregadosRentas(main.ARCHIVO_RENTAS), agregados)
+
+
+class TestCargaPorAnios(unittest.TestCase):
+    """
+    Al iniciar solo se carga completo el año actual; de los demás, las rentas abiertas.
+    """
+
+    def setUp(self):
+        self.anterior = os.getcwd()
+        self.carpeta = tempfile.mkdtemp()
+        os.chdir(self.carpeta)
+        main.REPOSITORIOS.clear()
+        inicio = datetime(2001, 5, 1, 10, 0, 0)
+        self.abierta = "2001.05.01.10.00.00"
+        self.cerrada = "2001.05.02.10.00.00"
+        os.makedirs("rentas")
+        with open(os.path.join("rentas", "2001.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                self.abierta: rentaDePrueba(self.abierta, inicio, 3, 2),
+                self.cerrada: rentaDePrueba(self.cerrada, inicio, 3, 1, estado="finalizado")
+            }, f)
+
+    def tearDown(self):
+        main.REPOSITORIOS.clear()
+        os.chdir(self.anterior)
+        shutil.rmtree(self.carpeta)
+
+    def test_alIniciarSoloSeCarganLasAbiertasDeOtrosAnios(self):
+        rentas = main.obtenerDatos(main.ARCHIVO_RENTAS)
+        self.assertEqual(set(rentas), {self.abierta})
+        self.assertTrue(os.path.exists(os.path.join("rentas", "2001.abiertas.json")))
+        self.assertIn(self.abierta, main.obtenerRepositorio(main.ARCHIVO_RENTAS)["reservas"]["rentas"])
+
+        main.REPOSITORIOS.clear() # Segundo inicio: las abiertas salen de 2001.abiertas.json
+        self.assertEqual(set(main.obtenerDatos(main.ARCHIVO_RENTAS)), {self.abierta})
+
+    def test_cargarAniosRentasCargaElAnioCompleto(self):
+        self.assertEqual(set(main.cargarAniosRentas([2001])), {self.abierta, self.cerrada})
+        self.assertEqual(set(main.filtrarRentasPorMes(main.cargarAniosRentas([2001]), 5, 2001)),
+                         {self.abierta, self.cerrada})
+
+    def test_compactarConservaLosAniosSinCargar(self):
+        rentas = main.obtenerDatos(main.ARCHIVO_RENTAS)
+        nueva = "2001.06.01.10.00.00"
+        self.assertTrue(main.registrarRenta(main.ARCHIVO_RENTAS, nueva,
+                                            rentaDePrueba(nueva, datetime(2001, 6, 1, 10), 2, 1)))
+        repo = main.obtenerRepositorio(main.ARCHIVO_RENTAS)
+        with main.bloqueoArchivo(main.ARCHIVO_RENTAS):
+            self.assertTrue(main.compactarRepositorioRentas(repo))
+        with open(os.path.join("rentas", "2001.json"), encoding="utf-8") as f:
+            self.assertEqual(set(json.load(f)), {self.abierta, self.cerrada, nueva})
+        self.assertEqual(set(rentas), {self.abierta, nueva})
+
+    def test_agregadosIncluyenLosAniosSinCargar(self):
+        rentas = main.obtenerDatos(main.ARCHIVO_RENTAS)
+        agregados = main.obtenerAgregadosRentas(rentas)
+        self.assertEqual(agregados, main.calcularAgregadosRentas(main.iterarRentas(main.ARCHIVO_RENTAS)))
+        self.assertEqual(agregados["accesorios"][("01", 2001, 5)][main.AGREGADO_RENTAS], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()